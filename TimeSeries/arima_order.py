@@ -0,0 +1,246 @@
+# ARIMA Order Selection
+
+'''
+Searches (p, d, q) instead of hard-coding order=(2, 1, 2):
+Differencing Once: Each series is differenced once per d and every (p, q) candidate reuses it.
+Choosing d: The smallest d whose differenced series passes the ADF test.
+Memoized Fits: Fits are cached by series hash + order, so repeated searches are free.
+Early Pruning: The largest model is fitted first. Every other candidate is nested in it, so its deviance
+is a floor for all of them, and candidates whose parameter penalty alone cannot beat the best AIC are skipped;
+the largest model is refitted from the best nested fit before its deviance is trusted.
+Parallel Search: Candidates of equal size are fitted across a process pool.
+'''
+
+import hashlib
+import os
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# (series hash, p, d, q) -> (aic, params); least recently used entries are evicted first
+_FIT_CACHE = OrderedDict()
+FIT_CACHE_SIZE = 100_000
+
+
+def clear_cache():
+    _FIT_CACHE.clear()
+
+
+def series_hash(values):
+    """Stable fingerprint of a series' values."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+
+def difference(values, d):
+    """Difference a series d times (d=0 returns it unchanged)."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.diff(values, n=d) if d else values
+
+
+def choose_d(values, max_d=2, alpha=0.05):
+    """Smallest d in 0..max_d whose differenced series is stationary under ADF."""
+    from statsmodels.tsa.stattools import adfuller
+
+    for d in range(max_d + 1):
+        diffed = difference(values, d)
+        if adfuller(diffed, autolag='AIC')[1] < alpha:
+            return d
+    return max_d
+
+
+def _fit_candidate(diffed, p, q, with_const, start_params=None):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            fitted = ARIMA(diffed, order=(p, 0, q),
+                           trend='c' if with_const else 'n').fit(start_params=start_params)
+        return fitted.aic, np.asarray(fitted.params)
+    except Exception:
+        return np.nan, None
+
+
+def _pad_params(params, p, q, p_max, q_max, with_const):
+    # Parameters of ARIMA(p, q) as a point of ARIMA(p_max, q_max): the extra
+    # AR and MA terms are zero. Layout: [const], ar.L1.., ma.L1.., sigma2
+    params = np.asarray(params, dtype=np.float64)
+    const, rest = params[:int(with_const)], params[int(with_const):]
+    return np.concatenate([const, rest[:p], np.zeros(p_max - p),
+                           rest[p:p + q], np.zeros(q_max - q), rest[-1:]])
+
+
+def select_order(values, p_max=3, q_max=3, d=None, max_d=2, n_jobs=1,
+                 prune_margin=2.0, use_cache=True, pool=None):
+    """Pick the ARIMA (p, d, q) with the lowest AIC.
+
+    d is chosen with choose_d unless given. The (p_max, q_max) model is
+    fitted first; every other candidate is nested in it, so at its optimum
+    none reaches a lower deviance (-2 log-likelihood). The rest are fitted
+    in order of increasing p + q, and a candidate is pruned when that
+    deviance floor plus its AIC penalty exceeds the best AIC so far plus
+    prune_margin. The optimizer may stop short of that optimum, so before
+    pruning, the largest model is refitted from the lowest-deviance nested
+    fit (extra terms zero), and pruned candidates are re-checked once all
+    levels are done; prune_margin (in AIC units) covers fits that still stop
+    short, and prune_margin=np.inf fits the full grid.
+    Returns (best_order, table) where the table lists every candidate with
+    its AIC and status ('fit', 'cached', 'pruned', 'failed'). The parameters
+    of the best fit (in the table's 'params' column) can be passed as warm
+    starts to arima_batch.fit_many.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if d is None:
+        d = choose_d(values, max_d)
+    diffed = difference(values, d)
+    with_const = d == 0
+    key = series_hash(values)
+
+    def n_params(p, q):
+        return p + q + int(with_const) + 1  # + sigma2
+
+    levels = {}
+    for p in range(p_max + 1):
+        for q in range(q_max + 1):
+            if (p, q) != (p_max, q_max):
+                levels.setdefault(p + q, []).append((p, q))
+
+    # (p, q) -> (aic, params, status)
+    results = {}
+
+    def record(p, q, aic, params, status):
+        if params is None:
+            results[(p, q)] = (np.nan, None, 'failed')
+            return
+        results[(p, q)] = (aic, params, status)
+        if use_cache and status == 'fit':
+            _FIT_CACHE[(key, p, d, q)] = (aic, params)
+            if len(_FIT_CACHE) > FIT_CACHE_SIZE:
+                _FIT_CACHE.popitem(last=False)
+
+    def cached(p, q):
+        cache_key = (key, p, d, q)
+        if use_cache and cache_key in _FIT_CACHE:
+            _FIT_CACHE.move_to_end(cache_key)
+            record(p, q, *_FIT_CACHE[cache_key], 'cached')
+            return True
+        return False
+
+    def deviances():
+        return {pq: aic - 2 * n_params(*pq) for pq, (aic, params, _) in results.items()
+                if params is not None}
+
+    def bounds():
+        # (deviance floor, best AIC); the minimum over all fits keeps the
+        # floor valid when a nested fit beats the largest one
+        fitted = deviances()
+        if (p_max, q_max) not in fitted:
+            return -np.inf, np.inf  # no floor, fit everything
+        best_aic = min(results[pq][0] for pq in fitted)
+        return min(fitted.values()), best_aic
+
+    def fit_all(to_fit):
+        if pool is not None and len(to_fit) > 1:
+            fits = pool.map(_fit_candidate, [diffed] * len(to_fit),
+                            [p for p, _ in to_fit], [q for _, q in to_fit],
+                            [with_const] * len(to_fit))
+        else:
+            fits = (_fit_candidate(diffed, p, q, with_const) for p, q in to_fit)
+        for (p, q), (aic, params) in zip(to_fit, fits):
+            record(p, q, aic, params, 'fit')
+
+    refitted_from = set()
+
+    def refine_floor():
+        # The optimizer can stop short of the largest model's optimum, leaving
+        # the floor too high; refit it from the lowest-deviance nested fit
+        # (extra terms zero), which it can only improve on
+        fitted = deviances()
+        nested = {pq: dev for pq, dev in fitted.items() if pq != (p_max, q_max)}
+        if not nested or (p_max, q_max) not in fitted:
+            return
+        start = min(nested, key=nested.get)
+        if start in refitted_from:
+            return
+        refitted_from.add(start)
+        aic, params = _fit_candidate(
+            diffed, p_max, q_max, with_const,
+            _pad_params(results[start][1], *start, p_max, q_max, with_const))
+        if params is not None and aic < results[(p_max, q_max)][0]:
+            record(p_max, q_max, aic, params, 'fit')
+
+    def prunable(p, q):
+        floor, best_aic = bounds()
+        if floor + 2 * n_params(p, q) <= best_aic + prune_margin:
+            return False
+        refine_floor()
+        floor, best_aic = bounds()
+        return floor + 2 * n_params(p, q) > best_aic + prune_margin
+
+    if not cached(p_max, q_max):
+        record(p_max, q_max, *_fit_candidate(diffed, p_max, q_max, with_const), 'fit')
+
+    own_pool = None
+    if pool is None and n_jobs != 1:
+        own_pool = pool = ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count())
+    try:
+        for size in sorted(levels):
+            to_fit = []
+            for p, q in levels[size]:
+                if cached(p, q):
+                    continue
+                if prunable(p, q):
+                    results[(p, q)] = (np.nan, None, 'pruned')
+                else:
+                    to_fit.append((p, q))
+            fit_all(to_fit)
+
+        # Later fits may lower the floor, so pruned candidates are re-checked
+        while True:
+            revived = [pq for pq, (_, _, status) in results.items()
+                       if status == 'pruned' and not prunable(*pq)]
+            if not revived:
+                break
+            fit_all(revived)
+    finally:
+        if own_pool is not None:
+            own_pool.shutdown()
+
+    rows = [(p, d, q, aic, params, status) for (p, q), (aic, params, status) in results.items()]
+    table = pd.DataFrame(rows, columns=['p', 'd', 'q', 'aic', 'params', 'status'])
+    table = table.sort_values('aic', na_position='last', ignore_index=True)
+    if table['aic'].isna().all():
+        raise ValueError("no ARIMA candidate could be fitted")
+    best = table.iloc[0]
+    return (int(best['p']), int(best['d']), int(best['q'])), table
+
+
+def _select_for_series(item, kwargs):
+    series_id, values = item
+    try:
+        order, table = select_order(values, **kwargs)
+        return series_id, order, table['aic'].iloc[0], None
+    except Exception as exc:
+        return series_id, None, np.nan, f"{type(exc).__name__}: {exc}"
+
+
+def select_orders(series, n_jobs=None, **kwargs):
+    """Run select_order for every series in a {series_id: values} dict in parallel.
+
+    Returns a frame with series_id, order, aic and error. Each worker keeps
+    its own fit cache; the candidates of one series are fitted sequentially.
+    """
+    items = list(series.items())
+    n_jobs = n_jobs or os.cpu_count() or 1
+    kwargs['n_jobs'] = 1
+    if n_jobs == 1:
+        results = [_select_for_series(item, kwargs) for item in items]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_select_for_series, items, [kwargs] * len(items),
+                                    chunksize=max(1, len(items) // (4 * n_jobs))))
+    return pd.DataFrame(results, columns=['series_id', 'order', 'aic', 'error'])
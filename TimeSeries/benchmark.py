@@ -0,0 +1,237 @@
+# Forecasting Benchmark
+
+'''
+Compares the forecasters used in timeSeries.py on cost and accuracy:
+Cases: Every model is run over each combination of series length and series count.
+Cost: Fit and predict wall time, and peak resident memory of a fresh worker process.
+Accuracy: MAE and MAPE on a holdout of the last `horizon` points.
+Report: A JSON file that can be compared against a baseline run to catch regressions.
+
+Usage: python benchmark.py --models naive arima --lengths 100 1000 --counts 1 10
+'''
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+def simulate_series(length, seed):
+    """Sine wave with noise, like section 1, shifted away from zero so MAPE is defined."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(length)
+    return 10 + np.sin(0.1 * t) + 0.5 * rng.standard_normal(length)
+
+
+# Each forecaster takes (train, horizon, options) and returns a fitted state
+# from fit() and an array of `horizon` forecasts from predict()
+
+def _fit_naive(train, horizon, options):
+    return train[-1]
+
+
+def _predict_naive(state, horizon, options):
+    return np.full(horizon, state)
+
+
+def _fit_arima(train, horizon, options):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return ARIMA(train, order=tuple(options.get('order', (2, 1, 2)))).fit()
+
+
+def _predict_arima(state, horizon, options):
+    return np.asarray(state.forecast(steps=horizon))
+
+
+def _fit_prophet(train, horizon, options):
+    from fbprophet import Prophet
+
+    frame = pd.DataFrame({'ds': pd.date_range('2022-01-01', periods=len(train), freq='D'),
+                          'y': train})
+    return Prophet().fit(frame)
+
+
+def _predict_prophet(state, horizon, options):
+    future = state.make_future_dataframe(periods=horizon)
+    return state.predict(future)['yhat'].to_numpy()[-horizon:]
+
+
+def _fit_lstm(train, horizon, options):
+    from tensorflow.keras.layers import LSTM, Dense
+    from tensorflow.keras.models import Sequential
+
+    from windowing import sliding_windows
+
+    seq_length = options.get('seq_length', 10)
+    low, high = train.min(), train.max()
+    scaled = ((train - low) / (high - low)).reshape(-1, 1)
+    X, y = sliding_windows(scaled, seq_length, copy=True)
+    model = Sequential([LSTM(50, activation='relu', input_shape=(seq_length, 1)), Dense(1)])
+    model.compile(optimizer='adam', loss='mse')
+    model.fit(X, y, epochs=options.get('epochs', 100), verbose=0)
+    return model, scaled[-seq_length:], low, high
+
+
+def _predict_lstm(state, horizon, options):
+    from lstm_forecast import recursive_forecast
+
+    model, history, low, high = state
+    return recursive_forecast(model, history, horizon)[:, 0] * (high - low) + low
+
+
+FORECASTERS = {
+    'naive': (_fit_naive, _predict_naive),
+    'arima': (_fit_arima, _predict_arima),
+    'prophet': (_fit_prophet, _predict_prophet),
+    'lstm': (_fit_lstm, _predict_lstm),
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(model, length, count, horizon=10, options=None, seed=0):
+    """Fit and forecast `count` series of `length` points with one model."""
+    options = options or {}
+    fit, predict = FORECASTERS[model]
+    fit_seconds, predict_seconds, abs_errors, pct_errors = [], [], [], []
+    failures = 0
+
+    # Warm-up on a short series so imports and graph tracing are not timed
+    try:
+        predict(fit(simulate_series(60, seed)[:-horizon], horizon, dict(options, epochs=1)),
+                horizon, options)
+    except Exception:
+        pass
+
+    for i in range(count):
+        series = simulate_series(length + horizon, seed + i)
+        train, test = series[:-horizon], series[-horizon:]
+        try:
+            started = time.perf_counter()
+            state = fit(train, horizon, options)
+            fitted = time.perf_counter()
+            forecast = predict(state, horizon, options)
+            done = time.perf_counter()
+        except Exception:
+            failures += 1
+            continue
+        fit_seconds.append(fitted - started)
+        predict_seconds.append(done - fitted)
+        abs_errors.append(np.abs(forecast - test))
+        pct_errors.append(np.abs((forecast - test) / test))
+
+    def summary(values, reduce):
+        return float(reduce(values)) if len(values) else None
+
+    return {
+        'model': model, 'length': length, 'count': count, 'horizon': horizon,
+        'failures': failures,
+        'fit_seconds_total': summary(fit_seconds, np.sum),
+        'fit_seconds_median': summary(fit_seconds, np.median),
+        'predict_seconds_total': summary(predict_seconds, np.sum),
+        'predict_seconds_median': summary(predict_seconds, np.median),
+        'peak_rss_mb': _peak_rss_mb(),
+        'mae': summary(abs_errors, np.mean),
+        'mape': summary(pct_errors, lambda e: 100 * np.mean(e)),
+    }
+
+
+def _run_case_args(args):
+    return run_case(*args)
+
+
+def run_benchmark(models, lengths, counts, horizon=10, options=None, seed=0):
+    """Run every (model, length, count) case and return the report dict.
+
+    Each case runs in a fresh worker process, so peak_rss_mb reflects that
+    case alone rather than everything measured before it.
+    """
+    options = options or {}
+    cases = [(model, length, count, horizon, options.get(model, {}), seed)
+             for model in models for length in lengths for count in counts]
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        results = pool.map(_run_case_args, cases, chunksize=1)
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current, tolerance=0.2):
+    """List cases whose fit time, predict time, memory or MAE grew by more than `tolerance`."""
+    def key(result):
+        return result['model'], result['length'], result['count'], result['horizon']
+
+    old = {key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = old.get(key(result))
+        if before is None:
+            continue
+        for metric in ('fit_seconds_median', 'predict_seconds_median', 'peak_rss_mb', 'mae'):
+            a, b = before.get(metric), result.get(metric)
+            if a and b and b > a * (1 + tolerance):
+                regressions.append({'model': result['model'], 'length': result['length'],
+                                    'count': result['count'], 'metric': metric,
+                                    'baseline': a, 'current': b})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--models', nargs='+', default=['naive', 'arima'], choices=sorted(FORECASTERS))
+    parser.add_argument('--lengths', nargs='+', type=int, default=[100, 1000])
+    parser.add_argument('--counts', nargs='+', type=int, default=[1, 10])
+    parser.add_argument('--horizon', type=int, default=10)
+    parser.add_argument('--epochs', type=int, default=100, help="LSTM training epochs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_report.json')
+    parser.add_argument('--baseline', help="previous report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.models, args.lengths, args.counts, args.horizon,
+                           options={'lstm': {'epochs': args.epochs}}, seed=args.seed)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    table = pd.DataFrame(report['results'])
+    print(table[['model', 'length', 'count', 'fit_seconds_median', 'predict_seconds_median',
+                 'peak_rss_mb', 'mae', 'mape']].to_string(index=False))
+    print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(json.load(f), report, args.tolerance)
+        for item in regressions:
+            print(f"REGRESSION {item['model']} length={item['length']} count={item['count']} "
+                  f"{item['metric']}: {item['baseline']:.4g} -> {item['current']:.4g}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# Fast Seasonal Decomposition
+
+'''
+A faster take on seasonal_decompose(x, model='additive', period=12):
+Cumulative-sum Trend: The centered moving average costs O(n) regardless of period.
+Many Series: 2-D input (series, time) is decomposed for all series at once.
+Multiple Periods: Several seasonal components (e.g. weekly and yearly) are peeled off in turn.
+Incremental Updates: IncrementalDecomposer extends the decomposition as points are appended.
+'''
+
+import warnings
+
+import numpy as np
+
+
+def _check(x):
+    x = np.asarray(x, dtype=np.float64)
+    if np.isnan(x).any():
+        raise ValueError("decomposition does not handle missing values")
+    return x
+
+
+def _window_width(period):
+    # seasonal_decompose uses a 2 x period MA (period + 1 points) for even periods
+    return period + 1 if period % 2 == 0 else period
+
+
+def centered_moving_average(x, period):
+    """Centered moving average along the last axis, NaN where the window is incomplete.
+
+    Uses window sums from a cumulative sum, so the cost does not grow with
+    the period. Matches the trend of statsmodels' seasonal_decompose.
+    """
+    x = _check(x)
+    n = x.shape[-1]
+    width = _window_width(period)
+    half = width // 2
+    trend = np.full(x.shape, np.nan)
+    if n < width:
+        return trend
+
+    # Centering first keeps the cumulative sum small and precise
+    offset = x.mean(axis=-1, keepdims=True)
+    centered = x - offset
+    csum = np.concatenate([np.zeros(x.shape[:-1] + (1,)),
+                           np.cumsum(centered, axis=-1)], axis=-1)
+    window_sum = csum[..., width:] - csum[..., :-width]
+    if period % 2 == 0:
+        # The two end points of the 2 x period MA only get half weight
+        window_sum = window_sum - 0.5 * (centered[..., :n - width + 1] + centered[..., width - 1:])
+    trend[..., half:n - half] = window_sum / period + offset
+    return trend
+
+
+def _seasonal_profile(detrended, period, model):
+    n = detrended.shape[-1]
+    pad = (-n) % period
+    padded = np.concatenate([detrended, np.full(detrended.shape[:-1] + (pad,), np.nan)], axis=-1)
+    folded = padded.reshape(detrended.shape[:-1] + (-1, period))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN phases
+        profile = np.nanmean(folded, axis=-2)
+    if model == 'additive':
+        return profile - profile.mean(axis=-1, keepdims=True)
+    return profile / profile.mean(axis=-1, keepdims=True)
+
+
+def _tile(profile, n, start=0):
+    period = profile.shape[-1]
+    idx = (np.arange(n) + start) % period
+    return profile[..., idx]
+
+
+def decompose(x, periods=12, model='additive'):
+    """Split x into trend, seasonal and residual components along the last axis.
+
+    `periods` is one period or a list of periods. With one period the result
+    equals seasonal_decompose(x, model, period). With several, the trend uses
+    the longest period and each seasonal component is estimated, in order of
+    increasing period, after removing the others. Returns a dict with
+    'trend', 'seasonal' (sum or product of all seasonal parts), 'resid' and
+    'seasonal_<period>' per period.
+    """
+    x = _check(x)
+    periods = sorted([periods] if np.isscalar(periods) else periods)
+    additive = model == 'additive'
+    trend = centered_moving_average(x, periods[-1])
+    detrended = x - trend if additive else x / trend
+
+    parts = {}
+    for _ in range(2 if len(periods) > 1 else 1):
+        for period in periods:
+            others = [parts[p] for p in periods if p != period and p in parts]
+            base = detrended
+            for other in others:
+                base = base - other if additive else base / other
+            parts[period] = _tile(_seasonal_profile(base, period, model), x.shape[-1])
+
+    seasonal = sum(parts.values()) if additive else np.prod(list(parts.values()), axis=0)
+    result = {'trend': trend, 'seasonal': seasonal,
+              'resid': detrended - seasonal if additive else detrended / seasonal}
+    for period, part in parts.items():
+        result[f'seasonal_{period}'] = part
+    return result
+
+
+class IncrementalDecomposer:
+    """Single-period decomposition that grows as points are appended.
+
+    Keeps only the last `period` raw points plus per-phase running sums of the
+    detrended values, so each append costs O(new points). Because the seasonal
+    profile keeps learning, residuals of early points can differ slightly from
+    a full recomputation. Works on one series or a batch (leading axes).
+    """
+
+    def __init__(self, period, model='additive'):
+        self.period = period
+        self.model = model
+        self._width = _window_width(period)
+        self._tail = None
+        self._n_seen = 0
+        self._phase_sum = None
+        self._phase_count = np.zeros(period)
+
+    @property
+    def seasonal_profile(self):
+        """Current seasonal value for each phase 0..period-1 (relative to the series start)."""
+        if self._phase_sum is None or (self._phase_count == 0).any():
+            return None
+        profile = self._phase_sum / self._phase_count
+        if self.model == 'additive':
+            return profile - profile.mean(axis=-1, keepdims=True)
+        return profile / profile.mean(axis=-1, keepdims=True)
+
+    def append(self, values):
+        """Add new points and return components for the newly completed positions.
+
+        Returns a dict with 'index' (positions in the full series) and the
+        'trend', 'seasonal' and 'resid' values there. The trend lags the
+        newest point by half a period, as a centered average must.
+        """
+        values = _check(values)
+        if self._tail is None:
+            self._tail = values[..., :0]
+            self._phase_sum = np.zeros(values.shape[:-1] + (self.period,))
+
+        buf = np.concatenate([self._tail, values], axis=-1)
+        start = self._n_seen - self._tail.shape[-1]  # series position of buf[..., 0]
+        half = self._width // 2
+
+        trend = centered_moving_average(buf, self.period)[..., half:buf.shape[-1] - half]
+        index = np.arange(trend.shape[-1]) + start + half
+        point = buf[..., half:half + trend.shape[-1]]
+        detrended = point - trend if self.model == 'additive' else point / trend
+
+        phases = index % self.period
+        sums = self._phase_sum.reshape(-1, self.period)
+        np.add.at(sums, (slice(None), phases), detrended.reshape(len(sums), -1))
+        self._phase_count += np.bincount(phases, minlength=self.period)
+
+        self._n_seen += values.shape[-1]
+        self._tail = buf[..., -(self._width - 1):] if self._width > 1 else buf[..., :0]
+
+        profile = self.seasonal_profile
+        if profile is None:
+            seasonal = np.full(detrended.shape, np.nan)
+        else:
+            seasonal = profile[..., phases]
+        resid = detrended - seasonal if self.model == 'additive' else detrended / seasonal
+        return {'index': index, 'trend': trend, 'seasonal': seasonal, 'resid': resid}
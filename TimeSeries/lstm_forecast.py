@@ -0,0 +1,93 @@
+# Batched Multi-step LSTM Forecasting
+
+'''
+Recursive forecasting without the per-step predict()/np.append loop:
+Ring Buffer: The input window lives in a preallocated buffer; each step writes one value.
+Direct Model Calls: Calls model(...) (optionally wrapped in tf.function) instead of predict().
+Batched Series: Forecasts many series in a single pass, in chunks of batch_size.
+'''
+
+import numpy as np
+
+
+def make_predict_fn(model, compiled=True):
+    """Return a function mapping an input batch to a NumPy array of predictions.
+
+    With compiled=True the model call is traced once with tf.function, which
+    avoids the per-call overhead of model.predict().
+    """
+    if compiled:
+        import tensorflow as tf
+
+        call = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+    else:
+        def call(x):
+            return model(x, training=False)
+
+    def predict(x):
+        return np.asarray(call(x))
+
+    return predict
+
+
+def _as_batch(history):
+    # Normalise input to (n_series, seq_length, features)
+    history = np.asarray(history, dtype=np.float32)
+    if history.ndim == 1:
+        return history[None, :, None]
+    if history.ndim == 2:
+        return history[None]
+    if history.ndim == 3:
+        return history
+    raise ValueError("history must be (time,), (time, features) or "
+                     "(series, time, features)")
+
+
+def _forecast_chunk(predict, history, steps):
+    n_series, seq_length, n_features = history.shape
+
+    # Each value is stored twice (at i and i + seq_length), so the current
+    # window is always the contiguous slice ring[:, head:head + seq_length]
+    ring = np.empty((n_series, 2 * seq_length, n_features), dtype=np.float32)
+    ring[:, :seq_length] = history
+    ring[:, seq_length:] = history
+    out = np.empty((n_series, steps, n_features), dtype=np.float32)
+
+    head = 0
+    for step in range(steps):
+        pred = predict(ring[:, head:head + seq_length]).reshape(n_series, -1)
+        if pred.shape[1] != n_features:
+            raise ValueError(f"model predicts {pred.shape[1]} values per step but "
+                             f"the input has {n_features} features")
+        out[:, step] = pred
+        # Overwrite the oldest value in both copies and advance
+        ring[:, head] = pred
+        ring[:, head + seq_length] = pred
+        head = (head + 1) % seq_length
+    return out
+
+
+def recursive_forecast(model, history, steps, batch_size=4096, compiled=True,
+                       predict_fn=None):
+    """Forecast `steps` values ahead by feeding each prediction back as input.
+
+    `history` holds the last seq_length (scaled) observations, either for a
+    single series ((time,) or (time, features)) or for many series at once
+    ((series, time, features)). Returns forecasts shaped like the input with
+    the time axis replaced by `steps`. Pass a function from make_predict_fn
+    as `predict_fn` to reuse one traced model across calls.
+    """
+    predict = predict_fn or make_predict_fn(model, compiled)
+    batch = _as_batch(history)
+
+    out = np.empty((batch.shape[0], steps, batch.shape[2]), dtype=np.float32)
+    for start in range(0, len(batch), batch_size):
+        out[start:start + batch_size] = _forecast_chunk(
+            predict, batch[start:start + batch_size], steps)
+
+    history = np.asarray(history)
+    if history.ndim == 1:
+        return out[0, :, 0]
+    if history.ndim == 2:
+        return out[0]
+    return out
@@ -0,0 +1,171 @@
+# Streaming Mini-batch Pipeline for LSTM Training
+
+'''
+Feeds model.fit without holding the full windowed tensor in memory:
+Chunked Reading: Reads a series from an in-memory array, a memory-mapped .npy file or a CSV.
+On-the-fly Windowing: Builds (X, y) windows per chunk, carrying the overlap across chunk edges.
+Bounded Shuffling: Shuffles within a fixed-size buffer, like tf.data's shuffle().
+Prefetching: Prepares the next batches on a background thread.
+tf.data Support: Wraps the generator as a tf.data.Dataset for Keras.
+'''
+
+import itertools
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+
+from windowing import sliding_windows, window_count
+
+
+def iter_series_chunks(source, chunk_size=100_000, columns=None, dtype=np.float32):
+    """Yield consecutive 2-D (time, features) chunks of a series.
+
+    `source` may be an array (including np.memmap), a path to a .npy file
+    (opened with mmap_mode='r', so only the touched pages are read) or a
+    path to a CSV file (read with pandas in chunks). `columns` selects CSV
+    columns to read.
+    """
+    if isinstance(source, str) and source.endswith('.csv'):
+        for frame in pd.read_csv(source, usecols=columns, chunksize=chunk_size):
+            yield frame.to_numpy(dtype=dtype).reshape(len(frame), -1)
+        return
+
+    if isinstance(source, str):
+        source = np.load(source, mmap_mode='r')
+    for start in range(0, len(source), chunk_size):
+        chunk = np.asarray(source[start:start + chunk_size], dtype=dtype)
+        yield chunk.reshape(len(chunk), -1)
+
+
+def iter_window_chunks(source, seq_length, chunk_size=100_000, stride=1, horizon=1,
+                       columns=None):
+    """Yield (X, y) windows chunk by chunk, identical to windowing the whole series."""
+    span = seq_length + horizon
+    carry = None
+    skip = 0
+    for chunk in iter_series_chunks(source, max(chunk_size, span), columns):
+        if skip:
+            dropped = min(skip, len(chunk))
+            chunk, skip = chunk[dropped:], skip - dropped
+        buf = chunk if carry is None else np.concatenate([carry, chunk])
+        n_windows = window_count(len(buf), seq_length, stride, horizon)
+        if n_windows:
+            yield sliding_windows(buf, seq_length, stride=stride, horizon=horizon)
+        # Keep the points the next window still needs; with stride > span the
+        # next window may start past the end of buf, so skip ahead into later chunks
+        next_start = n_windows * stride
+        carry = buf[next_start:].copy()
+        skip += max(0, next_start - len(buf))
+
+
+def _rebatch(window_chunks, batch_size, buffer_size=0, rng=None):
+    # Accumulate windows and emit fixed-size batches; with a buffer, shuffle
+    # within it and only release batches while buffer_size windows remain.
+    buf_X = buf_y = None
+    for X, y in window_chunks:
+        if buf_X is None:
+            buf_X, buf_y = np.ascontiguousarray(X), np.ascontiguousarray(y)
+        else:
+            buf_X, buf_y = np.concatenate([buf_X, X]), np.concatenate([buf_y, y])
+
+        n_ready = (len(buf_X) - buffer_size) // batch_size * batch_size
+        if n_ready <= 0:
+            continue
+        if rng is not None:
+            perm = rng.permutation(len(buf_X))
+            buf_X, buf_y = buf_X[perm], buf_y[perm]
+        for start in range(0, n_ready, batch_size):
+            yield buf_X[start:start + batch_size], buf_y[start:start + batch_size]
+        buf_X, buf_y = buf_X[n_ready:], buf_y[n_ready:]
+
+    if buf_X is not None and len(buf_X):
+        if rng is not None:
+            perm = rng.permutation(len(buf_X))
+            buf_X, buf_y = buf_X[perm], buf_y[perm]
+        for start in range(0, len(buf_X), batch_size):
+            yield buf_X[start:start + batch_size], buf_y[start:start + batch_size]
+
+
+def prefetch(iterator, depth=2):
+    """Run `iterator` on a background thread, keeping up to `depth` items ready."""
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def worker():
+        try:
+            for item in iterator:
+                while not stop.is_set():
+                    try:
+                        items.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stop.is_set():
+                    return
+            items.put(done)
+        except BaseException as exc:
+            items.put(exc)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def batch_generator(source, seq_length, batch_size=32, stride=1, horizon=1,
+                    chunk_size=100_000, shuffle_buffer=0, prefetch_depth=2,
+                    columns=None, seed=None):
+    """Yield (X_batch, y_batch) for one pass over the series.
+
+    Memory is bounded by chunk_size + shuffle_buffer windows, independent of
+    the series length. Set shuffle_buffer > 0 to shuffle within that buffer.
+    """
+    rng = np.random.default_rng(seed) if shuffle_buffer else None
+    chunks = iter_window_chunks(source, seq_length, chunk_size, stride, horizon, columns)
+    batches = _rebatch(chunks, batch_size, shuffle_buffer, rng)
+    if prefetch_depth:
+        batches = prefetch(batches, prefetch_depth)
+    return batches
+
+
+def make_tf_dataset(source, seq_length, batch_size=32, stride=1, horizon=1,
+                    chunk_size=100_000, shuffle_buffer=0, columns=None, seed=None):
+    """Wrap batch_generator as a tf.data.Dataset that can be passed to model.fit.
+
+    The generator is restarted for every epoch, with a fresh shuffle order
+    each time; tf.data handles prefetching.
+    """
+    import tensorflow as tf
+
+    # Peek at the first chunk to find the number of features
+    first = next(iter_series_chunks(source, seq_length + horizon, columns))
+    n_features = first.shape[1]
+    y_shape = (None, n_features) if horizon == 1 else (None, horizon, n_features)
+
+    epochs = itertools.count()
+
+    def generator():
+        epoch_seed = None if seed is None else [seed, next(epochs)]
+        return batch_generator(source, seq_length, batch_size, stride, horizon,
+                               chunk_size, shuffle_buffer, prefetch_depth=0,
+                               columns=columns, seed=epoch_seed)
+
+    dataset = tf.data.Dataset.from_generator(
+        generator,
+        output_signature=(
+            tf.TensorSpec(shape=(None, seq_length, n_features), dtype=tf.float32),
+            tf.TensorSpec(shape=y_shape, dtype=tf.float32),
+        ),
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
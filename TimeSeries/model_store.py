@@ -0,0 +1,187 @@
+# Persistent Fitted-model Store
+
+'''
+Skips refitting ARIMA, Prophet and LSTM when the input series has not changed:
+Keys: A fingerprint of the data plus the model kind and configuration.
+Formats: Pickle (statsmodels results, forecasts, anything picklable), Prophet JSON, Keras model files.
+Eviction: Least recently used entries are removed once the store exceeds its size or entry limit.
+Serving: get_or_fit/get_or_compute return the cached object, fitting only on a miss.
+'''
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+_EXTENSIONS = {'pickle': '.pkl', 'prophet': '.json', 'keras': '.keras'}
+
+
+def fingerprint(data):
+    """Stable hash of a Series, DataFrame or array (values, index and labels)."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        names = data.columns if isinstance(data, pd.DataFrame) else [data.name]
+        digest.update(repr(list(names)).encode())
+    else:
+        array = np.ascontiguousarray(data)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _atomic_write(path, write):
+    # Write to a temporary file next to `path`, then rename over it
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _save(obj, path, kind):
+    if kind == 'pickle':
+        def write(tmp):
+            with open(tmp, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    elif kind == 'prophet':
+        from fbprophet.serialize import model_to_json
+
+        def write(tmp):
+            with open(tmp, 'w') as f:
+                f.write(model_to_json(obj))
+    elif kind == 'keras':
+        def write(tmp):
+            obj.save(tmp)
+    else:
+        raise ValueError(f"unknown model kind: {kind!r}")
+    _atomic_write(path, write)
+
+
+def _load(path, kind):
+    if kind == 'pickle':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    if kind == 'prophet':
+        from fbprophet.serialize import model_from_json
+
+        with open(path) as f:
+            return model_from_json(f.read())
+    if kind == 'keras':
+        import tensorflow as tf
+
+        return tf.keras.models.load_model(path)
+    raise ValueError(f"unknown model kind: {kind!r}")
+
+
+class ModelStore:
+    """On-disk cache of fitted models and forecasts.
+
+    Entries are keyed by fingerprint(data) plus the model kind and a
+    JSON-serializable config, so any change to the data or the settings
+    leads to a refit. When the store holds more than max_bytes or
+    max_entries, the least recently used entries are deleted.
+    """
+
+    def __init__(self, root='model_cache', max_bytes=None, max_entries=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, 'index.json')
+        self._index = self._read_index()
+
+    def _read_index(self):
+        if not os.path.exists(self._index_path):
+            return {}
+        with open(self._index_path) as f:
+            index = json.load(f)
+        # Drop entries whose files were removed behind our back
+        return {key: entry for key, entry in index.items()
+                if os.path.exists(os.path.join(self.root, entry['file']))}
+
+    def _write_index(self):
+        def write(tmp):
+            with open(tmp, 'w') as f:
+                json.dump(self._index, f, indent=1)
+        _atomic_write(self._index_path, write)
+
+    def key(self, data, kind, config):
+        config_text = json.dumps(config, sort_keys=True, default=str)
+        raw = f"{fingerprint(data)}|{kind}|{config_text}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self._index.values())
+
+    def get(self, key):
+        """Load a stored object, or return None on a miss."""
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        obj = _load(os.path.join(self.root, entry['file']), entry['kind'])
+        entry['last_used'] = time.time()
+        self._write_index()
+        return obj
+
+    def put(self, key, obj, kind='pickle'):
+        filename = key + _EXTENSIONS.get(kind, '')
+        path = os.path.join(self.root, filename)
+        _save(obj, path, kind)
+        now = time.time()
+        self._index[key] = {'kind': kind, 'file': filename, 'bytes': os.path.getsize(path),
+                            'created': now, 'last_used': now}
+        self._evict(keep=key)
+        self._write_index()
+
+    def _evict(self, keep=None):
+        by_age = sorted(self._index, key=lambda k: self._index[k]['last_used'])
+        total = self.total_bytes
+        for key in by_age:
+            over_bytes = self.max_bytes is not None and total > self.max_bytes
+            over_count = self.max_entries is not None and len(self._index) > self.max_entries
+            if not (over_bytes or over_count):
+                break
+            if key == keep:
+                continue
+            entry = self._index.pop(key)
+            total -= entry['bytes']
+            path = os.path.join(self.root, entry['file'])
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get_or_fit(self, data, kind, config, fit):
+        """Return the cached model for (data, kind, config), calling fit() on a miss."""
+        key = self.key(data, kind, config)
+        model = self.get(key)
+        if model is None:
+            model = fit()
+            self.put(key, model, kind)
+        return model
+
+    def get_or_compute(self, data, config, compute):
+        """Like get_or_fit for picklable results such as forecasts."""
+        return self.get_or_fit(data, 'pickle', config, compute)
+
+    def clear(self):
+        for entry in self._index.values():
+            path = os.path.join(self.root, entry['file'])
+            if os.path.exists(path):
+                os.remove(path)
+        self._index = {}
+        self._write_index()
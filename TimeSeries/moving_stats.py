@@ -0,0 +1,152 @@
+# Streaming Moving Averages
+
+'''
+Online versions of rolling(window).mean()/std() and ewm(span).mean():
+O(1) Updates: Each new point updates running state instead of recomputing the column.
+Bulk Init: State is built from history with vectorized NumPy/pandas calls.
+Many Series: Updates may be scalars or arrays with one value per series.
+Checkpoints: state_dict()/from_state() round-trip through JSON, so workers can resume.
+'''
+
+import numpy as np
+import pandas as pd
+
+
+class RollingStats:
+    """Rolling mean and standard deviation over the last `window` points.
+
+    Matches pandas rolling(window).mean() and .std() (ddof=1): values are NaN
+    until `window` points have been seen.
+    """
+
+    def __init__(self, window):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self._buf = None
+        self._pos = 0
+        self._count = 0
+        self._mean = None
+        self._m2 = None
+
+    def _init_state(self, shape):
+        self._buf = np.zeros((self.window,) + shape)
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+
+    def update(self, x):
+        """Add one point (or one point per series) and return the rolling mean."""
+        x = np.asarray(x, dtype=np.float64)
+        if self._buf is None:
+            self._init_state(x.shape)
+
+        if self._count < self.window:
+            # Welford update while the window fills up
+            self._count += 1
+            delta = x - self._mean
+            self._mean = self._mean + delta / self._count
+            self._m2 = self._m2 + delta * (x - self._mean)
+        else:
+            # Replace the oldest point: shift mean and M2 by the difference
+            old = self._buf[self._pos]
+            old_mean = self._mean
+            self._mean = old_mean + (x - old) / self.window
+            self._m2 = np.maximum(self._m2 + (x - old) * (x - self._mean + old - old_mean), 0)
+
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        return self.mean
+
+    @property
+    def mean(self):
+        if self._count < self.window:
+            return np.full(np.shape(self._mean), np.nan)[()]
+        return self._mean[()]
+
+    @property
+    def var(self):
+        if self._count < self.window:
+            return np.full(np.shape(self._m2), np.nan)[()]
+        return (self._m2 / (self.window - 1))[()]
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    @classmethod
+    def from_history(cls, values, window):
+        """Build the state from past values, shaped (time,) or (time, n_series)."""
+        values = np.asarray(values, dtype=np.float64)
+        stats = cls(window)
+        tail = values[-window:]
+        stats._init_state(values.shape[1:])
+        stats._count = len(tail)
+        stats._pos = len(tail) % window
+        stats._buf[:len(tail)] = tail
+        if len(tail):
+            stats._mean = tail.mean(axis=0)
+            stats._m2 = ((tail - stats._mean) ** 2).sum(axis=0)
+        return stats
+
+    def state_dict(self):
+        """JSON-serializable snapshot of the accumulator."""
+        return {'window': self.window, 'pos': self._pos, 'count': self._count,
+                'buf': None if self._buf is None else self._buf.tolist(),
+                'mean': None if self._mean is None else np.asarray(self._mean).tolist(),
+                'm2': None if self._m2 is None else np.asarray(self._m2).tolist()}
+
+    @classmethod
+    def from_state(cls, state):
+        stats = cls(state['window'])
+        stats._pos = state['pos']
+        stats._count = state['count']
+        if state['buf'] is not None:
+            stats._buf = np.asarray(state['buf'], dtype=np.float64)
+            stats._mean = np.asarray(state['mean'], dtype=np.float64)
+            stats._m2 = np.asarray(state['m2'], dtype=np.float64)
+        return stats
+
+
+class EWMA:
+    """Exponential moving average, matching pandas ewm(..., adjust=False).mean()."""
+
+    def __init__(self, span=None, alpha=None):
+        if (span is None) == (alpha is None):
+            raise ValueError("pass exactly one of span or alpha")
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self._value = None
+
+    def update(self, x):
+        """Add one point (or one point per series) and return the new average."""
+        x = np.asarray(x, dtype=np.float64)
+        if self._value is None:
+            self._value = x.copy()
+        else:
+            self._value = self._value + self.alpha * (x - self._value)
+        return self.value
+
+    @property
+    def value(self):
+        return None if self._value is None else self._value[()]
+
+    @classmethod
+    def from_history(cls, values, span=None, alpha=None):
+        """Build the state from past values, shaped (time,) or (time, n_series)."""
+        ema = cls(span=span, alpha=alpha)
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            last = pd.DataFrame(values.reshape(len(values), -1)).ewm(
+                alpha=ema.alpha, adjust=False).mean().to_numpy()[-1]
+            ema._value = last.reshape(values.shape[1:])
+        return ema
+
+    def state_dict(self):
+        return {'alpha': self.alpha,
+                'value': None if self._value is None else np.asarray(self._value).tolist()}
+
+    @classmethod
+    def from_state(cls, state):
+        ema = cls(alpha=state['alpha'])
+        if state['value'] is not None:
+            ema._value = np.asarray(state['value'], dtype=np.float64)
+        return ema
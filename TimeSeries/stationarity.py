@@ -0,0 +1,183 @@
+# Batch Stationarity Testing
+
+'''
+Runs the section 9 ADF check over whole catalogs of series:
+Vectorized ADF: Series of equal length share one lag-matrix build and one batched least-squares solve.
+Lag Selection: AIC-based lag choice (like adfuller's autolag='AIC') for every series at once.
+Optional KPSS: KPSS from statsmodels as a second opinion.
+Parallel: Chunks of series run across a process pool.
+Result Table: One row per series with statistics, p-values and a verdict.
+'''
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from arima_batch import to_series_dict
+
+
+def _design(x, lags, regression):
+    # ADF regression for a batch of series x (N, T):
+    #   diff(y)_t = b * y_{t-1} + sum_j g_j * diff(y)_{t-j} + trend terms
+    # Columns: [y_{t-1}, diff lags 1..lags, trend terms]
+    T = x.shape[1]
+    xdiff = np.diff(x, axis=1)
+    nobs = T - 1 - lags
+    cols = [x[:, lags:T - 1]]
+    cols += [xdiff[:, lags - j:T - 1 - j] for j in range(1, lags + 1)]
+    t = np.arange(1, nobs + 1, dtype=np.float64)
+    if regression != 'n':
+        cols.append(np.ones((len(x), nobs)))
+    if regression in ('ct', 'ctt'):
+        cols.append(np.broadcast_to(t, (len(x), nobs)))
+    if regression == 'ctt':
+        cols.append(np.broadcast_to(t ** 2, (len(x), nobs)))
+    return np.stack(cols, axis=-1), xdiff[:, lags:]
+
+
+def _batch_ols(X, y):
+    # Least squares for every series at once via batched QR.
+    # Returns coefficients, SSR and diag[0] of (X'X)^-1 (for the t-stat of b).
+    q, r = np.linalg.qr(X)
+    coef = np.linalg.solve(r, np.einsum('bnk,bn->bk', q, y)[..., None])[..., 0]
+    resid = y - np.einsum('bnk,bk->bn', X, coef)
+    ssr = np.einsum('bn,bn->b', resid, resid)
+    r_inv = np.linalg.inv(r)
+    return coef, ssr, np.einsum('bk,bk->b', r_inv[:, 0], r_inv[:, 0])
+
+
+def _aic(ssr, nobs, n_params):
+    # Same AIC as statsmodels OLS, as used by adfuller(autolag='AIC')
+    llf = -nobs / 2 * (np.log(2 * np.pi) + np.log(ssr / nobs) + 1)
+    return -2 * llf + 2 * n_params
+
+
+def _adf_stat(x, lags, regression):
+    X, y = _design(x, lags, regression)
+    coef, ssr, inv00 = _batch_ols(X, y)
+    nobs, k = X.shape[1], X.shape[2]
+    return coef[:, 0] / np.sqrt(ssr / (nobs - k) * inv00), nobs
+
+
+def adf_batch(x, maxlag=None, regression='c', autolag='AIC'):
+    """Augmented Dickey-Fuller test for equal-length series (rows of x).
+
+    Follows statsmodels' adfuller: with autolag='AIC' each series gets the
+    lag count that minimizes AIC on a common sample, then is refitted with
+    that lag. regression is 'n', 'c', 'ct' or 'ctt' as in adfuller.
+    Returns arrays (stat, pvalue, usedlag, nobs, critvalues).
+    """
+    from statsmodels.tsa.adfvalues import mackinnoncrit, mackinnonp
+
+    if regression not in ('n', 'c', 'ct', 'ctt'):
+        raise ValueError("regression must be 'n', 'c', 'ct' or 'ctt'")
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    T = x.shape[1]
+    ntrend = len(regression) if regression != 'n' else 0
+    if maxlag is None:
+        maxlag = int(np.ceil(12.0 * np.power(T / 100.0, 1 / 4.0)))
+        maxlag = min(T // 2 - ntrend - 1, maxlag)
+    if maxlag < 0:
+        raise ValueError("series too short for the ADF test")
+
+    if autolag is None:
+        usedlag = np.full(len(x), maxlag)
+    else:
+        # Build the maxlag design once; each candidate lag is a column subset
+        X, y = _design(x, maxlag, regression)
+        trend_cols = list(range(maxlag + 1, X.shape[2]))
+        nobs = X.shape[1]
+        aics = []
+        for lag in range(maxlag + 1):
+            cols = list(range(lag + 1)) + trend_cols
+            _, ssr, _ = _batch_ols(X[:, :, cols], y)
+            aics.append(_aic(ssr, nobs, len(cols)))
+        usedlag = np.argmin(np.stack(aics), axis=0)
+
+    stat = np.empty(len(x))
+    nobs = np.empty(len(x), dtype=int)
+    for lag in np.unique(usedlag):
+        members = usedlag == lag
+        stat[members], nobs[members] = _adf_stat(x[members], int(lag), regression)
+
+    pvalue = np.array([mackinnonp(s, regression=regression, N=1) for s in stat])
+    crit = np.array([mackinnoncrit(N=1, regression=regression, nobs=n) for n in nobs])
+    return stat, pvalue, usedlag, nobs, crit
+
+
+def _kpss(values, regression):
+    from statsmodels.tsa.stattools import kpss
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # p-values outside the lookup table
+        stat, pvalue = kpss(values, regression='ct' if regression.startswith('ct') else 'c',
+                            nlags='auto')[:2]
+    return stat, pvalue
+
+
+def _test_group(ids, x, regression, maxlag, autolag, kpss, alpha):
+    stat, pvalue, usedlag, nobs, crit = adf_batch(x, maxlag, regression, autolag)
+    table = pd.DataFrame({'series_id': ids, 'nobs': nobs, 'adf_stat': stat,
+                          'adf_pvalue': pvalue, 'adf_lags': usedlag,
+                          'crit_1%': crit[:, 0], 'crit_5%': crit[:, 1],
+                          'crit_10%': crit[:, 2]})
+    adf_stationary = pvalue < alpha
+    if not kpss:
+        table['verdict'] = np.where(adf_stationary, 'stationary', 'non-stationary')
+        return table
+
+    kpss_results = np.array([_kpss(row, regression) for row in x])
+    table['kpss_stat'] = kpss_results[:, 0]
+    table['kpss_pvalue'] = kpss_results[:, 1]
+    # ADF's null is a unit root, KPSS's null is stationarity
+    kpss_stationary = table['kpss_pvalue'].to_numpy() >= alpha
+    table['verdict'] = np.select(
+        [adf_stationary & kpss_stationary, ~adf_stationary & ~kpss_stationary],
+        ['stationary', 'non-stationary'], 'inconclusive')
+    return table
+
+
+def stationarity_table(data, regression='c', maxlag=None, autolag='AIC', kpss=False,
+                       alpha=0.05, n_jobs=None, chunk_size=512,
+                       id_col=None, time_col=None, value_col=None):
+    """Test many series for stationarity and return one row per series.
+
+    `data` may be a 2-D array (one series per row), a wide DataFrame (one
+    column per series), a long DataFrame (with id_col/value_col) or a
+    {series_id: values} dict. Series of equal length are tested together in
+    chunks of chunk_size, spread over n_jobs processes (n_jobs=1 runs inline).
+    Missing values are dropped before testing.
+    """
+    if isinstance(data, np.ndarray):
+        data = dict(enumerate(np.atleast_2d(data)))
+    # ADF needs gap-free input, so interior missing values are dropped here
+    series = {key: values[~np.isnan(values)]
+              for key, values in to_series_dict(data, id_col, time_col, value_col).items()}
+
+    by_length = {}
+    for key, values in series.items():
+        by_length.setdefault(len(values), []).append(key)
+
+    tasks = []
+    for keys in by_length.values():
+        for start in range(0, len(keys), chunk_size):
+            ids = keys[start:start + chunk_size]
+            tasks.append((ids, np.stack([series[key] for key in ids])))
+
+    args = (regression, maxlag, autolag, kpss, alpha)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(tasks) <= 1:
+        tables = [_test_group(ids, x, *args) for ids, x in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [pool.submit(_test_group, ids, x, *args) for ids, x in tasks]
+            tables = [future.result() for future in futures]
+
+    if not tables:
+        return pd.DataFrame(columns=['series_id', 'nobs', 'adf_stat', 'adf_pvalue', 'verdict'])
+    order = {key: i for i, key in enumerate(series)}
+    result = pd.concat(tables, ignore_index=True)
+    return result.sort_values('series_id', key=lambda s: s.map(order), ignore_index=True)
@@ -18,16 +18,15 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.seasonal import seasonal_decompose
 from fbprophet import Prophet
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense
 
 # 1. Simulated Time Series Data
-np.random.seed(42)
+rng = np.random.default_rng(42)
 time = np.arange(100)
-data = np.sin(0.1 * time) + 0.5 * np.random.randn(100)
+data = np.sin(0.1 * time) + 0.5 * rng.standard_normal(100)
 
 # Create DataFrame
 df = pd.DataFrame({'Time': time, 'Value': data})
@@ -43,26 +42,45 @@ plt.grid(True)
 plt.show()
 
 # 3. Decomposing Time Series
-# Add trend and seasonality for demo purposes
-df['Trend'] = df['Value'].rolling(window=10).mean()
-df['Seasonal'] = df['Value'] - df['Trend']
-
-# Decompose time series
-result = seasonal_decompose(df['Value'], model='additive', period=12)
+# Decompose time series (same result as seasonal_decompose(df['Value'], model='additive', period=12),
+# with the trend from a cumulative sum; also takes several periods or a 2-D array of series)
+from decomposition import decompose
+result = decompose(df['Value'], periods=12, model='additive')
+df['Trend'] = result['trend']
+df['Seasonal'] = result['seasonal']
 
 # Plot the decomposition
-result.plot()
+fig, axes = plt.subplots(4, 1, figsize=(10, 8), sharex=True)
+for ax, (name, values) in zip(axes, [('Observed', df['Value']), ('Trend', result['trend']),
+                                     ('Seasonal', result['seasonal']), ('Residual', result['resid'])]):
+    ax.plot(df['Date'], values)
+    ax.set_ylabel(name)
+plt.tight_layout()
 plt.show()
 
 # 4. ARIMA Model
-# Fit ARIMA model (p, d, q)
-model_arima = ARIMA(df['Value'], order=(2, 1, 2))
-model_fit = model_arima.fit()
+# Search (p, d, q) by AIC instead of hard-coding it; fits are cached and weak candidates pruned
+from arima_order import select_order
+best_order, order_table = select_order(df['Value'], p_max=3, q_max=3)
+print("Best ARIMA order by AIC:", best_order)
+
+# Fit ARIMA model with the selected (p, d, q)
+# Fitted models are cached on disk by data fingerprint + config, so unchanged inputs skip the refit
+from model_store import ModelStore
+model_store = ModelStore('model_cache', max_bytes=2 * 1024 ** 3)
+model_fit = model_store.get_or_fit(df['Value'], 'pickle', {'model': 'arima', 'order': best_order},
+                                   lambda: ARIMA(df['Value'], order=best_order).fit())
 
 # Forecast
 forecast_arima = model_fit.forecast(steps=10)
 print("ARIMA Forecast:", forecast_arima)
 
+# The same fit/forecast for many series at once (wide frame: one column per series);
+# n_jobs > 1 fits across a process pool, warm_start=report reuses the fitted parameters
+from arima_batch import fit_many
+forecasts_batch, report_batch = fit_many(df[['Value']], order=best_order, steps=10, n_jobs=1)
+print("Batch ARIMA report:\n", report_batch[['series_id', 'aic', 'fit_seconds', 'error']])
+
 # Plot forecast
 plt.figure(figsize=(10, 5))
 plt.plot(df['Date'], df['Value'], label='Original')
@@ -76,8 +94,8 @@ plt.show()
 
 # 5. Prophet Model
 df_prophet = df[['Date', 'Value']].rename(columns={'Date': 'ds', 'Value': 'y'})
-model_prophet = Prophet()
-model_prophet.fit(df_prophet)
+model_prophet = model_store.get_or_fit(df_prophet, 'prophet', {'model': 'prophet'},
+                                       lambda: Prophet().fit(df_prophet))
 
 # Make future predictions
 future_dates = model_prophet.make_future_dataframe(periods=10)
@@ -90,13 +108,8 @@ plt.show()
 
 # 6. LSTM for Time Series Forecasting
 # Data Preprocessing for LSTM
-def create_sequences(data, seq_length):
-    sequences = []
-    labels = []
-    for i in range(len(data) - seq_length):
-        sequences.append(data[i:i + seq_length])
-        labels.append(data[i + seq_length])
-    return np.array(sequences), np.array(labels)
+# sliding_windows returns strided views, so the series is not copied seq_length times
+from windowing import sliding_windows
 
 # Normalize Data
 from sklearn.preprocessing import MinMaxScaler
@@ -104,31 +117,39 @@ scaler = MinMaxScaler()
 scaled_data = scaler.fit_transform(df[['Value']])
 
 # Create sequences
+# X already has the LSTM layout [samples, time steps, features]
 seq_length = 10
-X, y = create_sequences(scaled_data, seq_length)
-
-# Reshape for LSTM [samples, time steps, features]
-X = X.reshape((X.shape[0], X.shape[1], 1))
+X, y = sliding_windows(scaled_data, seq_length)
 
 # Build LSTM Model
-model_lstm = Sequential([
-    LSTM(50, activation='relu', input_shape=(seq_length, 1)),
-    Dense(1)
-])
-
-model_lstm.compile(optimizer='adam', loss='mse')
-model_lstm.fit(X, y, epochs=100, verbose=0)
+def fit_lstm():
+    model = Sequential([
+        LSTM(50, activation='relu', input_shape=(seq_length, 1)),
+        Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mse')
+    model.fit(X, y, epochs=100, verbose=0)
+    return model
+
+model_lstm = model_store.get_or_fit(scaled_data, 'keras',
+                                    {'model': 'lstm', 'seq_length': seq_length, 'units': 50, 'epochs': 100},
+                                    fit_lstm)
+
+# Streaming alternative for series that don't fit in memory once windowed:
+# save the scaled series, then window it chunk by chunk while training
+# from lstm_pipeline import make_tf_dataset
+# np.save('scaled_series.npy', scaled_data)
+# train_ds = make_tf_dataset('scaled_series.npy', seq_length, batch_size=32,
+#                            chunk_size=10_000, shuffle_buffer=1_000, seed=42)
+# model.fit(train_ds, epochs=100, verbose=0)  # in place of model.fit(X, y, ...) in fit_lstm
 
 # Forecasting using LSTM
-X_input = scaled_data[-seq_length:].reshape((1, seq_length, 1))
-lstm_forecast = []
-for _ in range(10):
-    next_value = model_lstm.predict(X_input)
-    lstm_forecast.append(next_value[0][0])
-    X_input = np.append(X_input[:, 1:, :], [[next_value]], axis=1)
+# Recursive 10-step forecast; pass a (series, seq_length, 1) array to forecast many series at once
+from lstm_forecast import recursive_forecast
+lstm_forecast = recursive_forecast(model_lstm, scaled_data[-seq_length:], steps=10)
 
 # Inverse scale forecast
-lstm_forecast = scaler.inverse_transform(np.array(lstm_forecast).reshape(-1, 1))
+lstm_forecast = scaler.inverse_transform(lstm_forecast.reshape(-1, 1))
 
 # Plot LSTM Forecast
 plt.figure(figsize=(10, 5))
@@ -142,16 +163,21 @@ plt.legend()
 plt.show()
 
 # 7. Autocorrelation and Partial Autocorrelation Plots
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
+# ACF via FFT and PACF via Levinson-Durbin, computed once and then plotted
+# (acf/pacf also accept a 2-D array with one series per row)
+from correlation import acf, pacf_from_acf, plot_correlation
+
+acf_values = acf(df['Value'], nlags=20)
+pacf_values = pacf_from_acf(acf_values)
 
 plt.figure(figsize=(12, 5))
 
 plt.subplot(1, 2, 1)
-plot_acf(df['Value'], lags=20, ax=plt.gca())
+plot_correlation(acf_values, len(df), ax=plt.gca(), kind='acf')
 plt.title('Autocorrelation')
 
 plt.subplot(1, 2, 2)
-plot_pacf(df['Value'], lags=20, ax=plt.gca())
+plot_correlation(pacf_values, len(df), ax=plt.gca(), kind='pacf')
 plt.title('Partial Autocorrelation')
 
 plt.tight_layout()
@@ -164,6 +190,15 @@ df['SMA_10'] = df['Value'].rolling(window=10).mean()
 # Exponential Moving Average
 df['EMA_10'] = df['Value'].ewm(span=10, adjust=False).mean()
 
+# Streaming: build the state from history once, then update in O(1) per new point
+# (state_dict()/from_state() checkpoint the state so a restarted worker can resume)
+from moving_stats import RollingStats, EWMA
+sma_state = RollingStats.from_history(df['Value'], window=10)
+ema_state = EWMA.from_history(df['Value'], span=10)
+new_point = np.sin(0.1 * len(df))
+print("SMA 10 after a new point:", sma_state.update(new_point))
+print("EMA 10 after a new point:", ema_state.update(new_point))
+
 # Plot SMA and EMA
 plt.figure(figsize=(10, 5))
 plt.plot(df['Date'], df['Value'], label='Original Data')
@@ -186,3 +221,9 @@ if result_adf[1] < 0.05:
     print("Time series is stationary")
 else:
     print("Time series is non-stationary")
+
+# Batch version: one row per series (2-D array, wide/long DataFrame or dict),
+# optionally with KPSS as a second opinion
+from stationarity import stationarity_table
+adf_table = stationarity_table(df[['Value']].dropna(), kpss=True, n_jobs=1)
+print(adf_table[['series_id', 'adf_stat', 'adf_pvalue', 'kpss_pvalue', 'verdict']])
@@ -0,0 +1,73 @@
+# Sequence Windowing for Time Series Models
+
+'''
+Helpers for turning a series into (X, y) training windows:
+Sliding Windows: Strided, read-only views over the series (no copy unless asked for).
+Multi-feature Input: 1-D series or 2-D (time, features) arrays.
+Stride and Horizon: Skip between windows and predict several steps ahead.
+Batched Generators: Yield contiguous mini-batches of windows one at a time.
+'''
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def window_count(n_samples, seq_length, stride=1, horizon=1):
+    """Number of (X, y) windows that fit in a series of n_samples points."""
+    if seq_length < 1 or stride < 1 or horizon < 1:
+        raise ValueError("seq_length, stride and horizon must be positive")
+    span = seq_length + horizon
+    if n_samples < span:
+        return 0
+    return (n_samples - span) // stride + 1
+
+
+def sliding_windows(data, seq_length, stride=1, horizon=1, copy=False):
+    """Split a series into input windows X and targets y.
+
+    X[i] is data[i*stride : i*stride + seq_length] and y[i] holds the
+    following `horizon` points. With horizon=1 the output matches the old
+    create_sequences loop. Both arrays are read-only views into `data`;
+    pass copy=True to get independent, contiguous arrays instead.
+    """
+    data = np.asarray(data)
+    if data.ndim not in (1, 2):
+        raise ValueError("data must be 1-D (time,) or 2-D (time, features)")
+    n_windows = window_count(len(data), seq_length, stride, horizon)
+    if n_windows == 0:
+        raise ValueError(f"series of length {len(data)} is too short for "
+                         f"seq_length={seq_length} and horizon={horizon}")
+
+    # Shape (windows, [features,] span) -> (windows, span[, features])
+    windows = sliding_window_view(data, seq_length + horizon, axis=0)[::stride]
+    if data.ndim == 2:
+        windows = np.moveaxis(windows, -1, 1)
+
+    X = windows[:, :seq_length]
+    y = windows[:, seq_length:]
+    if horizon == 1:
+        y = y[:, 0]
+
+    if copy:
+        return np.ascontiguousarray(X), np.ascontiguousarray(y)
+    return X, y
+
+
+def iter_window_batches(data, seq_length, batch_size=32, stride=1, horizon=1,
+                        shuffle=False, seed=None):
+    """Yield (X_batch, y_batch) mini-batches of windows.
+
+    Only one batch is materialized at a time, so memory stays at
+    batch_size * seq_length regardless of the series length.
+    """
+    X, y = sliding_windows(data, seq_length, stride=stride, horizon=horizon)
+    order = np.arange(len(X))
+    if shuffle:
+        np.random.default_rng(seed).shuffle(order)
+
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        if not shuffle:
+            idx = slice(idx[0], idx[-1] + 1)
+        # Fancy indexing / slicing + ascontiguousarray gives one compact copy
+        yield np.ascontiguousarray(X[idx]), np.ascontiguousarray(y[idx])
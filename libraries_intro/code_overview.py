@@ -5,13 +5,15 @@ import matplotlib.pyplot as plt
 
 # 1. Simulating the Restaurant Sales Data
 # We will create a dataset with sales of dishes for each day of the week.
+# A seeded Generator makes the simulated sales reproducible from run to run.
+rng = np.random.default_rng(42)
 data = {
     'Day': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
-    'Pasta': np.random.randint(10, 50, size=7),
-    'Pizza': np.random.randint(20, 60, size=7),
-    'Burger': np.random.randint(15, 55, size=7),
-    'Salad': np.random.randint(5, 30, size=7),
-    'Noodles': np.random.randint(10, 40, size=7)
+    'Pasta': rng.integers(10, 50, size=7),
+    'Pizza': rng.integers(20, 60, size=7),
+    'Burger': rng.integers(15, 55, size=7),
+    'Salad': rng.integers(5, 30, size=7),
+    'Noodles': rng.integers(10, 40, size=7)
 }
 
 df = pd.DataFrame(data)
@@ -67,8 +67,9 @@ plt.ylabel("Category")
 plt.show()
 
 # 5. Scatter Plot
-x_scatter = np.random.rand(100)
-y_scatter = np.random.rand(100)
+rng = np.random.default_rng(42)
+x_scatter = rng.random(100)
+y_scatter = rng.random(100)
 
 plt.figure(figsize=(8, 4))
 plt.scatter(x_scatter, y_scatter, c='purple')
@@ -79,7 +80,7 @@ plt.grid(True)
 plt.show()
 
 # 6. Histogram
-data = np.random.randn(1000)
+data = rng.standard_normal(1000)
 
 plt.figure(figsize=(8, 4))
 plt.hist(data, bins=30, color='green', edgecolor='black')
@@ -99,7 +100,7 @@ plt.title("Pie Chart Example")
 plt.show()
 
 # 8. Box Plot
-data_box = [np.random.rand(50) * 100, np.random.rand(50) * 80, np.random.rand(50) * 90]
+data_box = [rng.random(50) * 100, rng.random(50) * 80, rng.random(50) * 90]
 
 plt.figure(figsize=(8, 4))
 plt.boxplot(data_box)
@@ -131,7 +132,7 @@ plt.tight_layout()
 plt.show()
 
 # 10. Heatmap
-matrix = np.random.rand(10, 10)
+matrix = rng.random((10, 10))
 
 plt.figure(figsize=(8, 4))
 plt.imshow(matrix, cmap='hot', interpolation='nearest')
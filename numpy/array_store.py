@@ -0,0 +1,167 @@
+# Memory-mapped Array Store
+
+'''
+A directory of named .npy datasets that are opened, not loaded:
+Memory-mapped Reads: Datasets open with np.load(mmap_mode='r'), so opening costs milliseconds and
+slicing reads only the pages it touches.
+Chunked Appends: Rows are appended to the end of a dataset without rewriting what is already there.
+Named Datasets: One standard .npy file per name, readable by plain np.load as well.
+Lazy Slices: read() copies just a row range; iter_chunks() walks a dataset block by block.
+'''
+
+import os
+
+import numpy as np
+
+_MAGIC = b'\x93NUMPY\x01\x00'   # .npy format version 1.0
+_SUFFIX = '.npy'
+
+
+def _header(dtype, shape, size=None):
+    # .npy header padded to `size` bytes (a multiple of 64) so that a larger
+    # shape can later be written over it in place
+    text = ("{'descr': %r, 'fortran_order': False, 'shape': %r, }"
+            % (np.lib.format.dtype_to_descr(dtype), tuple(shape)))
+    if size is None:
+        # Room for a 20-digit row count whatever the current one is
+        longest = len(text) + 20
+        size = -(-(len(_MAGIC) + 2 + longest + 1) // 64) * 64
+    padding = size - len(_MAGIC) - 2 - len(text) - 1
+    if padding < 0:
+        raise ValueError("header does not fit its reserved space")
+    text = text + ' ' * padding + '\n'
+    return _MAGIC + len(text).to_bytes(2, 'little') + text.encode('latin1')
+
+
+def _read_header(f):
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    return shape, dtype, f.tell(), version == (1, 0) and not fortran_order
+
+
+class ArrayStore:
+    """Named, memory-mapped .npy datasets in one directory.
+
+    store = ArrayStore('data'); store.append('prices', chunk); store['prices'][10:20]
+    Arrays grow along their first axis; all appended chunks must share the
+    dataset's dtype and trailing shape.
+    """
+
+    def __init__(self, root, readonly=False):
+        self.root = root
+        self.readonly = readonly
+        if not readonly:
+            os.makedirs(root, exist_ok=True)
+        self._open = {}
+
+    def _path(self, name):
+        if not name or os.sep in name or (os.altsep and os.altsep in name) or name.startswith('.'):
+            raise ValueError(f"invalid dataset name {name!r}")
+        return os.path.join(self.root, name + _SUFFIX)
+
+    def names(self):
+        return sorted(entry[:-len(_SUFFIX)] for entry in os.listdir(self.root)
+                      if entry.endswith(_SUFFIX))
+
+    def __contains__(self, name):
+        return os.path.exists(self._path(name))
+
+    def info(self, name):
+        """Shape, dtype and size of a dataset, from its header alone."""
+        with open(self._path(name), 'rb') as f:
+            shape, dtype, offset, _ = _read_header(f)
+        return {'shape': shape, 'dtype': dtype, 'nbytes': int(np.prod(shape)) * dtype.itemsize,
+                'offset': offset}
+
+    def __getitem__(self, name):
+        """The whole dataset as a read-only memmap; nothing is read until sliced."""
+        path = self._path(name)
+        stat = os.stat(path)
+        stamp = stat.st_mtime_ns, stat.st_size
+        cached = self._open.get(name)
+        if cached is None or cached[0] != stamp:
+            cached = stamp, np.load(path, mmap_mode='r')
+            self._open[name] = cached
+        return cached[1]
+
+    def read(self, name, start=None, stop=None):
+        """Copy rows [start, stop) into memory, leaving the rest on disk."""
+        return np.array(self[name][start:stop])
+
+    def writable(self, name):
+        """The dataset as a read-write memmap, e.g. for workers filling their own rows."""
+        self._check_writable()
+        self._open.pop(name, None)
+        return np.load(self._path(name), mmap_mode='r+')
+
+    def iter_chunks(self, name, rows=1_000_000):
+        """Yield consecutive read-only views of `rows` rows each."""
+        data = self[name]
+        for start in range(0, len(data), rows):
+            yield data[start:start + rows]
+
+    def create(self, name, dtype, shape=(0,), overwrite=False):
+        """Create an empty (or zero-filled) dataset of the given shape."""
+        self._check_writable()
+        path = self._path(name)
+        if os.path.exists(path) and not overwrite:
+            raise FileExistsError(f"dataset {name!r} already exists")
+        dtype = np.dtype(dtype)
+        header = _header(dtype, shape)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(header)
+            f.truncate(len(header) + int(np.prod(shape)) * dtype.itemsize)
+        os.replace(path + '.tmp', path)
+        self._open.pop(name, None)
+
+    def append(self, name, chunk):
+        """Add rows to the end of a dataset, creating it from the first chunk.
+
+        Data is written before the header's row count is updated, so a crash
+        mid-append leaves the dataset at its previous length.
+        """
+        self._check_writable()
+        chunk = np.asarray(chunk)
+        if chunk.ndim == 0:
+            raise ValueError("append needs at least one dimension")
+        path = self._path(name)
+        if not os.path.exists(path):
+            self.create(name, chunk.dtype, (0,) + chunk.shape[1:])
+
+        with open(path, 'r+b') as f:
+            shape, dtype, offset, appendable = _read_header(f)
+            if not appendable:
+                raise ValueError(f"dataset {name!r} was not written by ArrayStore; "
+                                 f"copy it with write() before appending")
+            if chunk.shape[1:] != tuple(shape[1:]):
+                raise ValueError(f"chunk rows have shape {chunk.shape[1:]}, "
+                                 f"dataset rows have shape {tuple(shape[1:])}")
+            if not np.can_cast(chunk.dtype, dtype, casting='same_kind'):
+                raise TypeError(f"cannot append {chunk.dtype} to a {dtype} dataset")
+            f.seek(offset + int(np.prod(shape)) * dtype.itemsize)
+            f.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+            f.flush()
+            f.seek(0)
+            f.write(_header(dtype, (shape[0] + len(chunk),) + tuple(shape[1:]), size=offset))
+        self._open.pop(name, None)
+        return shape[0] + len(chunk)
+
+    def write(self, name, data, chunk_rows=1_000_000, overwrite=False):
+        """Store `data` (an array or memmap of any size) chunk by chunk."""
+        self._check_writable()
+        data = np.asarray(data) if not hasattr(data, 'shape') else data
+        self.create(name, data.dtype, (0,) + tuple(data.shape[1:]), overwrite=overwrite)
+        for start in range(0, len(data), chunk_rows):
+            self.append(name, data[start:start + chunk_rows])
+
+    def delete(self, name):
+        self._check_writable()
+        self._open.pop(name, None)
+        os.remove(self._path(name))
+
+    def _check_writable(self):
+        if self.readonly:
+            raise PermissionError("store was opened read-only")
@@ -2,7 +2,7 @@
 
 '''
 Notebook contains:
-Array Creation: Creating arrays using np.array(), np.zeros(), np.ones(), np.arange(), np.random().
+Array Creation: Creating arrays using np.array(), np.zeros(), np.ones(), np.arange(), np.random.default_rng().
 Array Properties: Checking array shape, size, and data types.
 Array Indexing and Slicing: Accessing array elements and sub-arrays.
 Reshaping Arrays: Reshaping and flattening arrays.
@@ -11,9 +11,9 @@ Broadcasting: Demonstrating broadcasting of smaller arrays.
 Mathematical Functions: Sum, mean, standard deviation, min/max, and more.
 Matrix Operations: Dot product, transpose, and matrix inverse.
 Random Functions: Creating arrays of random values and random integers.
-Sorting and Searching: Sorting arrays and searching for values.
+Sorting and Searching: Sorting arrays, top-k selection without a full sort, and searching for values.
 Linear Algebra: Solving linear equations.
-Saving and Loading Data: Saving and loading numpy arrays.
+Saving and Loading Data: Saving, loading and memory-mapping numpy arrays.
 '''
 
 
@@ -42,7 +42,9 @@ arr_range = np.arange(0, 10, 2)
 print("\nArray with Range (0 to 10, step 2):\n", arr_range)
 
 # Create an array of random values between 0 and 1
-arr_random = np.random.random((3, 3))
+# (a seeded Generator gives reproducible values without touching global state)
+rng = np.random.default_rng(42)
+arr_random = rng.random((3, 3))
 print("\nRandom Array (3x3):\n", arr_random)
 
 # 2. Array Properties
@@ -129,6 +131,12 @@ min_value = np.min(arr_2d)
 print("\nMax value in arr_2d:", max_value)
 print("Min value in arr_2d:", min_value)
 
+# Same statistics for arrays larger than memory (e.g. np.load(..., mmap_mode='r')):
+# computed block by block in one pass, along any axis, on a thread pool
+from streaming_stats import reduce_blocks
+column_stats = reduce_blocks(arr_2d, stats=('sum', 'mean', 'std', 'max', 'min'), axis=0, block_rows=1)
+print("\nBlockwise column statistics of arr_2d:", column_stats)
+
 # 8. Matrix Operations
 # Dot product of two matrices
 arr_a = np.array([[1, 2], [3, 4]])
@@ -145,15 +153,28 @@ arr_square = np.array([[1, 2], [3, 4]])
 arr_inverse = np.linalg.inv(arr_square)
 print("\nInverse of arr_square:\n", arr_inverse)
 
+# To apply an inverse to a vector, solve instead: one LU factorization, no inverse,
+# and more accurate than arr_inverse @ vector
+print("Solve arr_square @ x = [1, 1] without the inverse:", np.linalg.solve(arr_square, np.array([1, 1])))
+
 # 9. Random Functions
 # Random integers within a range
-arr_randint = np.random.randint(0, 10, size=(3, 3))
+arr_randint = rng.integers(0, 10, size=(3, 3))
 print("\nRandom Integer Array (3x3) between 0 and 10:\n", arr_randint)
 
 # Random values from a normal distribution
-arr_normal = np.random.randn(3, 3)
+arr_normal = rng.standard_normal((3, 3))
 print("\nRandom Array from Normal Distribution (3x3):\n", arr_normal)
 
+# Large random data in parallel: every block of the output gets its own stream from
+# SeedSequence.spawn, so the values depend only on the seed, not on the number of workers
+from simulation import normal, simulate_sales
+big_normal = normal((1_000_000,), seed=42, n_jobs=4)
+print("\nParallel normal sample: mean {:.4f}, std {:.4f}".format(big_normal.mean(), big_normal.std()))
+print("Same values with 1 worker:", np.array_equal(big_normal, normal((1_000_000,), seed=42, n_jobs=1)))
+sales, dishes = simulate_sales(7, seed=42)
+print("Simulated daily sales for", dishes, ":\n", sales)
+
 # 10. Sorting and Searching
 # Sorting an array
 arr_unsorted = np.array([5, 2, 9, 1, 5, 6])
@@ -164,6 +185,22 @@ print("\nSorted Array:\n", arr_sorted)
 arr_sorted_indices = np.argsort(arr_unsorted)
 print("Indices of the sorted array:\n", arr_sorted_indices)
 
+# Only the largest few: np.argpartition finds them in O(n), and only those k get sorted
+from selection import top_k, top_k_stream, external_sort
+top_values, top_indices = top_k(big_normal, 5)
+print("\nTop 5 of big_normal:", top_values, "at", top_indices)
+print("Same as the full sort:", np.array_equal(top_values, np.sort(big_normal)[::-1][:5]))
+print("3 smallest of arr_unsorted:", top_k(arr_unsorted, 3, largest=False))
+
+# The same on data streamed in blocks (e.g. a memmap), holding one block plus k in memory
+stream_values, stream_indices = top_k_stream(big_normal, 5, block_rows=100_000)
+print("Streamed top 5 matches:", np.array_equal(stream_indices, top_indices))
+
+# Sorting more than fits in memory: sorted runs on disk, merged into one .npy file
+sorted_on_disk = external_sort(big_normal, 'sorted_normal.npy', block_rows=250_000)
+print("External sort matches np.sort:", np.array_equal(sorted_on_disk, np.sort(big_normal)))
+del sorted_on_disk
+
 # Searching for elements
 search_index = np.where(arr_1d == 3)
 print("\nIndex where arr_1d == 3:", search_index)
@@ -179,6 +216,15 @@ constants = np.array([9, 8])
 solution = np.linalg.solve(coefficients, constants)
 print("\nSolution of linear equations:\n", solution)
 
+# Many small systems: stack them as (N, k, k) and (N, k) and solve in one call;
+# a singular member falls back to least squares instead of failing the batch
+from batched_solve import solve_batched
+stacked_coefficients = np.stack([coefficients, [[1, 2], [2, 4]], [[2, 0], [0, 4]]])
+stacked_constants = np.stack([constants, [3, 6], [2, 8]])
+solutions, singular = solve_batched(stacked_coefficients, stacked_constants, return_singular=True)
+print("\nBatched solutions:\n", solutions)
+print("Singular systems:", singular)
+
 # 12. Saving and Loading Data
 # Save array to a file
 np.save('array_file.npy', arr_1d)
@@ -188,3 +234,15 @@ print("\nArray saved to 'array_file.npy'")
 loaded_array = np.load('array_file.npy')
 print("Loaded Array from file:\n", loaded_array)
 
+# Load only the part that is needed: mmap_mode maps the file instead of reading it
+mapped_array = np.load('array_file.npy', mmap_mode='r')
+print("Memory-mapped slice [1:3]:", mapped_array[1:3])
+
+# Large arrays: a store of named datasets that grow by appending chunks and open
+# as memmaps, so readers start immediately and touch only the pages they slice
+from array_store import ArrayStore
+store = ArrayStore('array_store')
+store.write('arr_1d', arr_1d, overwrite=True)
+store.append('arr_1d', np.arange(6, 11))
+print("Stored datasets:", store.names(), store.info('arr_1d')['shape'])
+print("Lazy slice of stored array [3:7]:", store['arr_1d'][3:7])
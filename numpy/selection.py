@@ -0,0 +1,133 @@
+# Top-k Selection and External Sorting
+
+'''
+Alternatives to a full np.sort / np.argsort when only part of the order is needed:
+Top-k: np.argpartition finds the k largest (or smallest) values in O(n); only those k are sorted.
+Streamed Top-k: Blocks of a memmap or chunk iterable are reduced to their own top-k and merged,
+so memory stays at one block plus k.
+External Sort: Arrays larger than memory are sorted as runs on disk, then combined with a
+vectorized k-way merge into one sorted .npy file.
+'''
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+def top_k(a, k, axis=-1, largest=True):
+    """The k largest (or smallest) values along `axis`, sorted, and their indices.
+
+    Returns (values, indices); values are in descending order for
+    largest=True and ascending otherwise. NaN counts as larger than any
+    number, as in np.sort. Ties at the k-th value are broken arbitrarily.
+    """
+    a = np.asarray(a)
+    n = a.shape[axis]
+    k = max(0, min(k, n))
+    if k < n:
+        part = np.argpartition(a, min(n - k, n - 1) if largest else max(k - 1, 0), axis=axis)
+    else:
+        part = np.argsort(a, axis=axis, kind='stable')
+    picked = np.arange(n - k, n) if largest else np.arange(k)
+    indices = np.take(part, picked, axis=axis)
+    values = np.take_along_axis(a, indices, axis=axis)
+
+    # Sort just the k selected values
+    order = np.argsort(values, axis=axis, kind='stable')
+    if largest:
+        order = np.flip(order, axis=axis)
+    return np.take_along_axis(values, order, axis=axis), np.take_along_axis(indices, order, axis=axis)
+
+
+def _blocks(data, block_rows):
+    if hasattr(data, 'shape'):
+        for start in range(0, len(data), block_rows):
+            yield data[start:start + block_rows]
+    else:
+        yield from data
+
+
+def top_k_stream(data, k, largest=True, block_rows=10_000_000):
+    """top_k over a 1-D array, memmap or iterable of 1-D chunks, one block at a time.
+
+    Returns (values, indices) with indices counted from the start of the
+    stream. Each block is reduced to its own top k, which is merged into
+    the running top k, so the work is O(n) and memory is one block plus k.
+    """
+    best_values = best_indices = None
+    offset = 0
+    for block in _blocks(data, block_rows):
+        block = np.asarray(block).ravel()
+        values, indices = top_k(block, k, largest=largest)
+        indices = indices + offset
+        offset += len(block)
+        if best_values is not None:
+            values = np.concatenate([best_values, values])
+            indices = np.concatenate([best_indices, indices])
+            values, keep = top_k(values, k, largest=largest)
+            indices = indices[keep]
+        best_values, best_indices = values, indices
+    if best_values is None:
+        raise ValueError("no data to select from")
+    return best_values, best_indices
+
+
+def _merge_runs(runs, out, buffer_rows):
+    # Vectorized k-way merge: read a buffer from every run and emit everything
+    # up to the smallest buffer end, since no unread value can be below it
+    positions = [0] * len(runs)
+    written = 0
+    while True:
+        active = [i for i, run in enumerate(runs) if positions[i] < len(run)]
+        if not active:
+            return written
+        heads = {i: np.asarray(runs[i][positions[i]:positions[i] + buffer_rows]) for i in active}
+        ends = np.array([heads[i][-1] for i in active
+                         if positions[i] + len(heads[i]) < len(runs[i])])
+        # NaN sorts last; a run whose buffer ends in NaN holds only NaN from there on
+        ends = ends[ends == ends]
+        cutoff = ends.min() if len(ends) else None
+
+        pieces = []
+        for i in active:
+            head = heads[i]
+            take = len(head) if cutoff is None else int(np.searchsorted(head, cutoff, side='right'))
+            pieces.append(head[:take])
+            positions[i] += take
+        merged = np.sort(np.concatenate(pieces), kind='stable')
+        out[written:written + len(merged)] = merged
+        written += len(merged)
+
+
+def external_sort(data, path, block_rows=10_000_000, buffer_rows=1_000_000, tmp_dir=None):
+    """Sort a 1-D array, memmap or iterable of chunks that may not fit in memory.
+
+    Each block of block_rows values is sorted in memory and written to disk
+    as a run; the runs are then merged buffer_rows values at a time into the
+    .npy file at `path`. Peak memory is about one block during the first
+    phase and (number of runs) x buffer_rows during the merge. Returns the
+    result opened as a read-only memmap.
+    """
+    run_dir = tempfile.mkdtemp(prefix='external_sort_', dir=tmp_dir)
+    try:
+        run_paths = []
+        dtype = None
+        for block in _blocks(data, block_rows):
+            block = np.sort(np.asarray(block).ravel())
+            if not len(block):
+                continue
+            dtype = block.dtype if dtype is None else np.result_type(dtype, block.dtype)
+            run_paths.append(os.path.join(run_dir, f'run-{len(run_paths):06d}.npy'))
+            np.save(run_paths[-1], block)
+        runs = [np.load(run, mmap_mode='r') for run in run_paths]
+        total = sum(len(run) for run in runs)
+
+        out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype or np.float64, shape=(total,))
+        _merge_runs(runs, out, buffer_rows)
+        out.flush()
+        del out, runs
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    return np.load(path, mmap_mode='r')
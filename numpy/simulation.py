@@ -0,0 +1,102 @@
+# Parallel, Reproducible Random Data
+
+'''
+Synthetic data from np.random.Generator instead of the legacy global np.random state:
+Independent Streams: SeedSequence(seed).spawn() gives every block of the output its own Generator.
+Fixed Blocks: The output is always cut into the same blocks, so the data depends only on the seed,
+never on how many workers filled it.
+Parallel Fill: Blocks are filled in place by a thread pool (Generator methods release the GIL),
+into an array or a memmap (e.g. ArrayStore.writable) larger than memory.
+Datasets: Daily restaurant sales (as in code_overview.py) and noisy sine-wave time series
+(as in timeSeries.py).
+'''
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def block_generators(seed, n_blocks):
+    """One independent Generator per block, derived from a single seed."""
+    return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(n_blocks)]
+
+
+def fill_parallel(out, fill, seed=None, block_rows=65536, n_jobs=None):
+    """Fill `out` block by block along axis 0 with fill(rng, block, start).
+
+    Block i always covers rows [i * block_rows, (i + 1) * block_rows) and
+    always gets the i-th spawned Generator, so the result is identical for
+    any n_jobs. `fill` writes into `block` in place (e.g. via out=).
+    Returns `out`.
+    """
+    n_blocks = -(-len(out) // block_rows)
+    generators = block_generators(seed, n_blocks)
+
+    def run(i):
+        start = i * block_rows
+        fill(generators[i], out[start:start + block_rows], start)
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        for i in range(n_blocks):
+            run(i)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            list(pool.map(run, range(n_blocks)))
+    return out
+
+
+def uniform(shape, seed=None, n_jobs=None, out=None, block_rows=65536):
+    """Uniform [0, 1) floats, like np.random.random(shape)."""
+    out = np.empty(shape) if out is None else out
+    return fill_parallel(out, lambda rng, block, _: rng.random(out=block), seed, block_rows, n_jobs)
+
+
+def normal(shape, seed=None, n_jobs=None, out=None, block_rows=65536):
+    """Standard normal floats, like np.random.randn(*shape)."""
+    out = np.empty(shape) if out is None else out
+    return fill_parallel(out, lambda rng, block, _: rng.standard_normal(out=block),
+                         seed, block_rows, n_jobs)
+
+
+DISHES = {'Pasta': (10, 50), 'Pizza': (20, 60), 'Burger': (15, 55), 'Salad': (5, 30),
+          'Noodles': (10, 40)}
+
+
+def simulate_sales(n_days, dishes=None, seed=None, n_jobs=None, out=None, block_rows=65536):
+    """Daily sales per dish: an (n_days, n_dishes) int array, column j uniform in [low_j, high_j).
+
+    `dishes` maps dish name -> (low, high); defaults to code_overview.py's menu.
+    Returns (sales, dish_names).
+    """
+    dishes = DISHES if dishes is None else dishes
+    low = np.array([bounds[0] for bounds in dishes.values()])
+    high = np.array([bounds[1] for bounds in dishes.values()])
+    out = np.empty((n_days, len(dishes)), dtype=np.int32) if out is None else out
+
+    def fill(rng, block, _):
+        block[:] = rng.integers(low, high, size=block.shape)
+
+    return fill_parallel(out, fill, seed, block_rows, n_jobs), list(dishes)
+
+
+def simulate_series(length, n_series=1, frequency=0.1, noise=0.5, seed=None, n_jobs=None,
+                    out=None, block_rows=None):
+    """sin(frequency * t) + noise * N(0, 1), as in timeSeries.py.
+
+    Returns shape (length,) for one series or (n_series, length); with many
+    series each block holds whole series, otherwise a block is a time range.
+    """
+    shape = (length,) if n_series == 1 else (n_series, length)
+    out = np.empty(shape) if out is None else out
+    wave = np.sin(frequency * np.arange(length))
+    if block_rows is None:
+        block_rows = 65536 if n_series == 1 else max(1, 65536 // max(length, 1))
+
+    def fill(rng, block, start):
+        rng.standard_normal(out=block)
+        block *= noise
+        block += wave[start:start + len(block)] if n_series == 1 else wave
+
+    return fill_parallel(out, fill, seed, block_rows, n_jobs)
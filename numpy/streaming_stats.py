@@ -0,0 +1,171 @@
+# Streaming Reductions
+
+'''
+np.sum / np.mean / np.std / np.max / np.min for arrays that do not fit in memory:
+Blockwise: The array (an ndarray, a memmap, or an iterable of chunks) is read block by block along axis 0.
+Any Axis: Reductions over axis 0 merge per-block partials; reductions over other axes are finished
+block by block and stacked.
+Stable Merges: Means and variances combine with Chan's parallel form of Welford's update,
+so no sum of squares is ever formed.
+Thread Pool: Blocks are reduced in worker threads, since NumPy releases the GIL inside reductions.
+'''
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+STATS = ('count', 'sum', 'mean', 'var', 'std', 'min', 'max')
+
+
+def _block_rows(data, target_bytes=64 * 1024 ** 2):
+    row_bytes = int(np.prod(data.shape[1:], dtype=np.int64)) * np.dtype(data.dtype).itemsize
+    return max(1, target_bytes // max(row_bytes, 1))
+
+
+def _blocks(data, block_rows):
+    if hasattr(data, 'shape'):
+        rows = block_rows or _block_rows(data)
+        for start in range(0, data.shape[0], rows):
+            yield data[start:start + rows]
+    else:
+        yield from data
+
+
+def _partial(block, axes, stats):
+    # Count, sum, mean, M2 (sum of squared deviations), min and max of one block
+    block = np.asarray(block)
+    partial = {'n': int(np.prod([block.shape[a] for a in axes], dtype=np.int64))}
+    if 'sum' in stats:
+        partial['sum'] = block.sum(axis=axes)
+    if {'mean', 'var', 'std'} & stats:
+        values = block.astype(np.float64, copy=False)
+        mean = values.mean(axis=axes, keepdims=True)
+        partial['mean'] = np.squeeze(mean, axis=axes)
+        if {'var', 'std'} & stats:
+            partial['m2'] = ((values - mean) ** 2).sum(axis=axes)
+    if 'min' in stats:
+        partial['min'] = block.min(axis=axes)
+    if 'max' in stats:
+        partial['max'] = block.max(axis=axes)
+    return partial
+
+
+def _merge(a, b):
+    # Chan et al.: combine two partials as if their blocks had been one
+    n = a['n'] + b['n']
+    merged = {'n': n}
+    if 'sum' in a:
+        merged['sum'] = a['sum'] + b['sum']
+    if 'mean' in a:
+        delta = b['mean'] - a['mean']
+        merged['mean'] = a['mean'] + delta * (b['n'] / n)
+        if 'm2' in a:
+            merged['m2'] = a['m2'] + b['m2'] + delta ** 2 * (a['n'] * b['n'] / n)
+    if 'min' in a:
+        merged['min'] = np.minimum(a['min'], b['min'])
+    if 'max' in a:
+        merged['max'] = np.maximum(a['max'], b['max'])
+    return merged
+
+
+def _finalize(partial, stats, ddof):
+    result = {}
+    for stat in stats:
+        if stat == 'count':
+            result[stat] = partial['n']
+        elif stat in ('var', 'std'):
+            n = partial['n']
+            var = partial['m2'] / (n - ddof) if n > ddof else np.full_like(partial['m2'], np.nan)
+            result[stat] = np.sqrt(var) if stat == 'std' else var
+        else:
+            result[stat] = partial[stat]
+    return result
+
+
+def _ordered_map(func, items, n_jobs):
+    # Like pool.map, but with at most 2 * n_jobs blocks in memory at once
+    if n_jobs == 1:
+        for item in items:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * n_jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def reduce_blocks(data, stats=('sum', 'mean', 'std', 'min', 'max'), axis=None, ddof=0,
+                  block_rows=None, n_jobs=None):
+    """Compute several statistics in one pass over `data`; returns {stat: result}.
+
+    `data` is an array or memmap (read block_rows rows at a time, by default
+    about 64 MB per block) or an iterable of chunks stacked along axis 0.
+    `axis` is None, an int or a tuple, as in numpy. stats are any of
+    count, sum, mean, var, std, min, max; means and variances are float64.
+    """
+    stats = [stats] if isinstance(stats, str) else list(stats)
+    unknown = set(stats) - set(STATS)
+    if unknown:
+        raise ValueError(f"unsupported statistics {sorted(unknown)}; use {STATS}")
+    blocks = _blocks(data, block_rows)
+    first = next(blocks, None)
+    if first is None:
+        raise ValueError("no data to reduce")
+    ndim = np.ndim(first)
+    axes = tuple(range(ndim)) if axis is None else \
+        tuple(sorted(a % ndim for a in ((axis,) if np.isscalar(axis) else axis)))
+
+    def reduce_one(block):
+        return _partial(block, axes, set(stats)) if len(block) else None
+
+    def all_blocks():
+        yield first
+        yield from blocks
+
+    partials = (p for p in _ordered_map(reduce_one, all_blocks(), n_jobs or os.cpu_count() or 1)
+                if p is not None)
+    if 0 in axes:
+        # Reducing across blocks: merge the partials in block order
+        merged = None
+        for partial in partials:
+            merged = partial if merged is None else _merge(merged, partial)
+        if merged is None:
+            raise ValueError("no data to reduce")
+        return _finalize(merged, stats, ddof)
+
+    # Axis 0 is kept, so every block yields its own rows of the result
+    pieces = [_finalize(partial, stats, ddof) for partial in partials]
+    if not pieces:
+        raise ValueError("no data to reduce")
+    return {stat: pieces[0][stat] if stat == 'count' else
+            np.concatenate([piece[stat] for piece in pieces]) for stat in stats}
+
+
+def block_sum(data, axis=None, **kwargs):
+    return reduce_blocks(data, 'sum', axis, **kwargs)['sum']
+
+
+def block_mean(data, axis=None, **kwargs):
+    return reduce_blocks(data, 'mean', axis, **kwargs)['mean']
+
+
+def block_var(data, axis=None, ddof=0, **kwargs):
+    return reduce_blocks(data, 'var', axis, ddof, **kwargs)['var']
+
+
+def block_std(data, axis=None, ddof=0, **kwargs):
+    return reduce_blocks(data, 'std', axis, ddof, **kwargs)['std']
+
+
+def block_min(data, axis=None, **kwargs):
+    return reduce_blocks(data, 'min', axis, **kwargs)['min']
+
+
+def block_max(data, axis=None, **kwargs):
+    return reduce_blocks(data, 'max', axis, **kwargs)['max']
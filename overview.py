@@ -31,12 +31,18 @@ mean_salary_by_age = df.groupby('Age')['Salary'].mean()
 print("\nMean Salary by Age:\n", mean_salary_by_age)
 
 # Handling missing data
-df_with_nan = df.copy()
-df_with_nan.loc[1, 'Salary'] = np.nan
+# (assign replaces only the Salary column instead of copying the whole frame)
+df_with_nan = df.assign(Salary=df['Salary'].where(df.index != 1))
 print("\nDataFrame with NaN:\n", df_with_nan)
-df_filled = df_with_nan.fillna(df_with_nan['Salary'].mean())
+df_filled = df_with_nan.assign(Salary=df_with_nan['Salary'].fillna(df_with_nan['Salary'].mean()))
 print("\nNaN Filled with Mean Salary:\n", df_filled)
 
+# Per-group mean in one vectorized pass (groups with no value keep the overall mean)
+group_mean = df_with_nan.groupby(df_with_nan['Age'] >= 30)['Salary'].transform('mean')
+df_group_filled = df_with_nan.assign(
+    Salary=df_with_nan['Salary'].fillna(group_mean).fillna(df_with_nan['Salary'].mean()))
+print("\nNaN Filled with Group Mean Salary (Age >= 30):\n", df_group_filled)
+
 
 # Section 2: numpy
 
@@ -84,8 +90,9 @@ plt.ylabel("Salary")
 plt.show()
 
 # Scatter Plot
-x = np.random.random(100)
-y = np.random.random(100)
+rng = np.random.default_rng(42)
+x = rng.random(100)
+y = rng.random(100)
 
 plt.figure(figsize=(7, 5))
 plt.scatter(x, y, c='r', label='Random Scatter')
@@ -98,13 +105,13 @@ plt.show()
 
 # Histogram
 plt.figure(figsize=(7, 5))
-data = np.random.randn(1000)
+data = rng.standard_normal(1000)
 plt.hist(data, bins=30)
 plt.title("Histogram")
 plt.show()
 
 # Heatmap (using numpy data)
-matrix = np.random.rand(10, 10)
+matrix = rng.random((10, 10))
 
 plt.figure(figsize=(7, 5))
 plt.imshow(matrix, cmap='hot', interpolation='nearest')
@@ -0,0 +1,204 @@
+# Out-of-core GroupBy Aggregation
+
+'''
+df.groupby(by).agg(spec) for data that arrives in chunks:
+Partial Aggregates: Each chunk is reduced to per-group count, sum, M2 (for variance), min and max.
+Mergeable: Partials combine across chunks and across worker processes in any order.
+Approximate Quantiles: A small weighted-sample sketch per group gives median and other quantiles.
+Same Shape: The final result has the index and columns pandas' .agg() would produce.
+'''
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+_EXACT = ('count', 'sum', 'mean', 'min', 'max', 'var', 'std')
+
+
+def _normalize(spec):
+    # {'Salary': 'mean'} / {'Salary': ['mean', 'max']} -> {'Salary': [...]}
+    if not isinstance(spec, dict):
+        raise TypeError("spec must be a dict of column -> function name(s)")
+    normalized = {}
+    for col, funcs in spec.items():
+        funcs = [funcs] if isinstance(funcs, str) else list(funcs)
+        for func in funcs:
+            if func not in _EXACT and _quantile_of(func) is None:
+                raise ValueError(f"unsupported aggregation {func!r}; use one of {_EXACT}, "
+                                 f"'median' or 'q<fraction>' such as 'q0.9'")
+        normalized[col] = funcs
+    return normalized
+
+
+def _quantile_of(func):
+    if func == 'median':
+        return 0.5
+    if isinstance(func, str) and func.startswith('q'):
+        try:
+            q = float(func[1:])
+        except ValueError:
+            return None
+        return q if 0 <= q <= 1 else None
+    return None
+
+
+def _compress(values, weights, size):
+    # Keep at most `size` weighted points that preserve the distribution's ranks
+    if len(values) <= size:
+        return values, weights
+    order = np.argsort(values, kind='stable')
+    values, weights = values[order], weights[order]
+    total = weights.sum()
+    targets = (np.arange(size) + 0.5) * total / size
+    idx = np.searchsorted(np.cumsum(weights), targets)
+    return values[np.minimum(idx, len(values) - 1)], np.full(size, total / size)
+
+
+def _sketch_quantile(values, weights, q):
+    if len(values) == 0:
+        return np.nan
+    order = np.argsort(values, kind='stable')
+    values, weights = values[order], weights[order]
+    total = weights.sum()
+    if total <= 1:
+        return values[0]
+    # With unit weights this is exactly pandas' linear interpolation
+    positions = (np.cumsum(weights) - weights / 2 - 0.5) / (total - 1)
+    return np.interp(q, positions, values)
+
+
+def partial_aggregate(chunk, by, spec, sketch_size=256):
+    """Reduce one chunk to mergeable per-group statistics.
+
+    Returns {'stats': frame, 'sketches': {column: {group: (values, weights)}}};
+    sketches are only kept for columns that need a quantile.
+    """
+    spec = _normalize(spec)
+    cols = list(spec)
+    if not isinstance(by, str) and len(by) == 1:
+        # Iterating groupby(['a']) yields 1-tuples; keep keys matching the index
+        by = by[0]
+    grouped = chunk.groupby(by, sort=False)[cols]
+    count = grouped.count()
+    stats = pd.concat({'count': count, 'sum': grouped.sum(),
+                       'm2': (grouped.var(ddof=0) * count).fillna(0),
+                       'min': grouped.min(), 'max': grouped.max()}, axis=1)
+
+    sketches = {}
+    for col, funcs in spec.items():
+        if not any(_quantile_of(func) is not None for func in funcs):
+            continue
+        sketches[col] = {}
+        for key, values in chunk.groupby(by, sort=False)[col]:
+            values = values.dropna().to_numpy(dtype=np.float64)
+            sketches[col][key] = _compress(values, np.ones(len(values)), sketch_size)
+    return {'stats': stats, 'sketches': sketches, 'sketch_size': sketch_size}
+
+
+def merge_partials(partials):
+    """Combine partial aggregates from any number of chunks or processes."""
+    partials = list(partials)
+    if len(partials) == 1:
+        return partials[0]
+    stacked = pd.concat([p['stats'] for p in partials])
+    levels = list(range(stacked.index.nlevels))
+
+    def reduce(stat, how):
+        return getattr(stacked[stat].groupby(level=levels, sort=False), how)()
+
+    count = reduce('count', 'sum')
+    sums = reduce('sum', 'sum')
+
+    # Chan et al.: M2 = sum of partial M2 + n_i * (mean_i - mean)^2
+    grand_mean = (sums / count).reindex(stacked.index)
+    part_mean = stacked['sum'] / stacked['count']
+    spread = (stacked['count'] * (part_mean - grand_mean) ** 2).fillna(0)
+    m2 = (stacked['m2'] + spread).groupby(level=levels, sort=False).sum()
+
+    stats = pd.concat({'count': count, 'sum': sums, 'm2': m2,
+                       'min': reduce('min', 'min'), 'max': reduce('max', 'max')}, axis=1)
+
+    size = partials[0]['sketch_size']
+    sketches = {}
+    for col in partials[0]['sketches']:
+        merged = {}
+        for partial in partials:
+            for key, (values, weights) in partial['sketches'][col].items():
+                if key in merged:
+                    values = np.concatenate([merged[key][0], values])
+                    weights = np.concatenate([merged[key][1], weights])
+                merged[key] = _compress(values, weights, size)
+        sketches[col] = merged
+    return {'stats': stats, 'sketches': sketches, 'sketch_size': size}
+
+
+def finalize(partial, spec):
+    """Turn merged partials into the frame df.groupby(by).agg(spec) would return."""
+    spec_in = spec
+    spec = _normalize(spec)
+    stats = partial['stats'].sort_index()
+    count = stats['count']
+
+    columns = {}
+    for col, funcs in spec.items():
+        for func in funcs:
+            n = count[col]
+            if func == 'count':
+                values = n
+            elif func in ('sum', 'min', 'max'):
+                values = stats[func][col]
+            elif func == 'mean':
+                values = stats['sum'][col] / n
+            elif func in ('var', 'std'):
+                values = stats['m2'][col] / (n - 1).where(n > 1)
+                values = np.sqrt(values) if func == 'std' else values
+            else:
+                q = _quantile_of(func)
+                sketch = partial['sketches'][col]
+                values = pd.Series([_sketch_quantile(*sketch[key], q) for key in stats.index],
+                                   index=stats.index)
+            columns[(col, func)] = values
+
+    result = pd.DataFrame(columns)
+    if all(isinstance(funcs, str) for funcs in spec_in.values()):
+        result.columns = [col for col, _ in result.columns]
+    return result
+
+
+def aggregate(chunks, by, spec, n_jobs=1, sketch_size=256, merge_every=32):
+    """Group-by aggregation over an iterable of DataFrame chunks.
+
+    Chunks are reduced in up to n_jobs worker processes while the next ones
+    are read; partials are merged every merge_every results, so memory is
+    bounded by the number of groups rather than the number of rows. Pair with
+    csv_loader.iter_csv to aggregate files larger than RAM.
+    """
+    pending = []
+
+    def collect(partial):
+        pending.append(partial)
+        if len(pending) >= merge_every:
+            pending[:] = [merge_partials(pending)]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        for chunk in chunks:
+            collect(partial_aggregate(chunk, by, spec, sketch_size))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            in_flight = set()
+            for chunk in chunks:
+                # Bound the number of chunks held in memory at once
+                if len(in_flight) >= 2 * n_jobs:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                in_flight.add(pool.submit(partial_aggregate, chunk, by, spec, sketch_size))
+            for future in in_flight:
+                collect(future.result())
+
+    if not pending:
+        raise ValueError("no chunks to aggregate")
+    return finalize(merge_partials(pending), spec)
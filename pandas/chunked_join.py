@@ -0,0 +1,250 @@
+# Out-of-core Joins
+
+'''
+pd.merge for inputs too large to join in memory:
+Hash-partitioned Join: Both sides are split by key hash into partitions on disk, then joined one partition at a time.
+Parallel Partitions: Partitions can be joined in worker processes.
+Sort-merge Join: Inputs already sorted by key are joined as streams, without spilling.
+pd.merge Semantics: inner, left, right and outer joins give the same rows in the same order as pd.merge.
+Spill Statistics: Rows, bytes and partition sizes written to disk are reported.
+'''
+
+import glob
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+_LEFT_ROW = '__left_row'
+_RIGHT_ROW = '__right_row'
+
+
+def _as_chunks(data, chunk_rows=1_000_000):
+    if isinstance(data, pd.DataFrame):
+        return (data.iloc[i:i + chunk_rows] for i in range(0, max(len(data), 1), chunk_rows))
+    return data
+
+
+def _key_list(on, left_on, right_on):
+    if on is not None:
+        left_on = right_on = on
+    if left_on is None or right_on is None:
+        raise ValueError("pass on=, or both left_on= and right_on=")
+    left_on = [left_on] if isinstance(left_on, str) else list(left_on)
+    right_on = [right_on] if isinstance(right_on, str) else list(right_on)
+    if len(left_on) != len(right_on):
+        raise ValueError("left_on and right_on must have the same length")
+    return left_on, right_on
+
+
+def _partition_codes(keys, n_partitions):
+    # Numeric keys are hashed as float64 so 1 and 1.0 (or int32 and int64)
+    # land in the same partition, as pd.merge would match them
+    keys = keys.apply(lambda col: col.astype(np.float64)
+                      if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col)
+                      else col)
+    keys.columns = range(keys.shape[1])
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return (hashes % np.uint64(n_partitions)).astype(np.int64)
+
+
+def _spill(chunks, keys, n_partitions, directory, side, row_col, stats):
+    offset = 0
+    schema = None
+    rows = np.zeros(n_partitions, dtype=np.int64)
+    for number, chunk in enumerate(chunks):
+        chunk = chunk.assign(**{row_col: np.arange(offset, offset + len(chunk))})
+        offset += len(chunk)
+        if schema is None:
+            schema = chunk.iloc[:0]
+        if not len(chunk):
+            continue
+        codes = _partition_codes(chunk[keys], n_partitions)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(n_partitions + 1))
+        for part in np.flatnonzero(np.diff(bounds)):
+            piece = chunk.iloc[order[bounds[part]:bounds[part + 1]]]
+            path = os.path.join(directory, f'{side}-{part:05d}-{number:07d}.pkl')
+            piece.to_pickle(path)
+            rows[part] += len(piece)
+            stats[f'{side}_bytes'] += os.path.getsize(path)
+            stats['files'] += 1
+    if schema is None:
+        raise ValueError(f"{side} input has no chunks")
+    schema.to_pickle(os.path.join(directory, f'{side}-schema.pkl'))
+    stats[f'{side}_rows'] = int(offset)
+    stats[f'{side}_max_partition_rows'] = int(rows.max()) if len(rows) else 0
+
+
+def _read_partition(directory, side, part):
+    pieces = [pd.read_pickle(path) for path in
+              sorted(glob.glob(os.path.join(directory, f'{side}-{part:05d}-*.pkl')))]
+    if not pieces:
+        return pd.read_pickle(os.path.join(directory, f'{side}-schema.pkl'))
+    return pd.concat(pieces, ignore_index=True)
+
+
+def _join_partition(directory, part, how, left_on, right_on, suffixes):
+    left = _read_partition(directory, 'left', part)
+    right = _read_partition(directory, 'right', part)
+    if not len(left) and not len(right):
+        return None
+    on = left_on if left_on == right_on else None
+    return pd.merge(left, right, how=how, on=on,
+                    left_on=None if on else left_on, right_on=None if on else right_on,
+                    suffixes=suffixes)
+
+
+def _pandas_order(frame, how, left_on, right_on):
+    # Reproduce pd.merge's row order from the original row numbers
+    if how in ('inner', 'left'):
+        by = [_LEFT_ROW, _RIGHT_ROW]
+    elif how == 'right':
+        by = [_RIGHT_ROW, _LEFT_ROW]
+    else:
+        # Outer joins are sorted by key, then by left and right row
+        if left_on == right_on:
+            sort_keys = frame[left_on]
+        else:
+            sort_keys = pd.DataFrame({i: frame[l].combine_first(frame[r])
+                                      for i, (l, r) in enumerate(zip(left_on, right_on))})
+        sort_keys = sort_keys.set_axis([f'__key{i}' for i in range(sort_keys.shape[1])], axis=1)
+        frame = pd.concat([frame, sort_keys], axis=1)
+        by = list(sort_keys.columns) + [_LEFT_ROW, _RIGHT_ROW]
+    frame = frame.sort_values(by, kind='stable', na_position='last')
+    return frame.drop(columns=[c for c in frame.columns if c.startswith('__key')])
+
+
+def hash_join(left, right, how='inner', on=None, left_on=None, right_on=None,
+              n_partitions=64, spill_dir=None, n_jobs=1, suffixes=('_x', '_y'),
+              chunk_rows=1_000_000, output='frame'):
+    """Join two large inputs by spilling hash partitions to disk.
+
+    `left` and `right` are DataFrames or iterables of chunks (e.g. from
+    csv_loader.iter_csv). Each partition holds roughly 1/n_partitions of
+    each side, so peak memory is one partition's join, not the whole join.
+
+    With output='frame' the result matches pd.merge(left, right, how, ...)
+    row for row; output='chunks' yields each partition's result as soon as
+    it is ready (unordered). Returns (result, stats), where stats reports
+    rows, bytes and the largest partition spilled per side.
+    """
+    if how not in ('inner', 'left', 'right', 'outer'):
+        raise ValueError(f"unsupported join type {how!r}")
+    left_on, right_on = _key_list(on, left_on, right_on)
+
+    own_dir = spill_dir is None
+    directory = tempfile.mkdtemp(prefix='hash_join_') if own_dir else spill_dir
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+    stats = {'partitions': n_partitions, 'files': 0, 'left_bytes': 0, 'right_bytes': 0}
+    _spill(_as_chunks(left, chunk_rows), left_on, n_partitions, directory, 'left', _LEFT_ROW, stats)
+    _spill(_as_chunks(right, chunk_rows), right_on, n_partitions, directory, 'right', _RIGHT_ROW, stats)
+    stats['spill_seconds'] = time.perf_counter() - started
+
+    def partition_results():
+        args = (how, left_on, right_on, suffixes)
+        try:
+            if n_jobs == 1:
+                for part in range(n_partitions):
+                    yield _join_partition(directory, part, *args)
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as pool:
+                    futures = [pool.submit(_join_partition, directory, part, *args)
+                               for part in range(n_partitions)]
+                    for future in futures:
+                        yield future.result()
+        finally:
+            if own_dir:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    helpers = [_LEFT_ROW, _RIGHT_ROW]
+    if output == 'chunks':
+        chunks = (frame.drop(columns=helpers) for frame in partition_results()
+                  if frame is not None and len(frame))
+        return chunks, stats
+
+    frames = [frame for frame in partition_results() if frame is not None]
+    result = pd.concat(frames, ignore_index=True)
+    result = _pandas_order(result, how, left_on, right_on)
+    stats['total_seconds'] = time.perf_counter() - started
+    return result.drop(columns=helpers).reset_index(drop=True), stats
+
+
+def merge_sorted(left_chunks, right_chunks, how='inner', on=None, left_on=None,
+                 right_on=None, suffixes=('_x', '_y')):
+    """Sort-merge join of two chunk streams that are already sorted by key.
+
+    Yields joined chunks in key order without spilling anything to disk:
+    rows are joined once no later chunk can contain their key. Memory is
+    bounded by the chunk size plus the largest run of a single key.
+    Keys must be non-null; multi-column keys compare lexicographically.
+    """
+    left_on, right_on = _key_list(on, left_on, right_on)
+    left_iter, right_iter = iter(left_chunks), iter(right_chunks)
+    left_buf = next(left_iter, None)
+    right_buf = next(right_iter, None)
+    if left_buf is None or right_buf is None:
+        raise ValueError("both inputs need at least one chunk (possibly empty)")
+    left_done = right_done = False
+    merge_on = left_on if left_on == right_on else None
+
+    def before(frame, cols, boundary):
+        # Lexicographic frame[cols] < boundary, row by row
+        less = np.zeros(len(frame), dtype=bool)
+        equal = np.ones(len(frame), dtype=bool)
+        for col, value in zip(cols, boundary):
+            values = frame[col].to_numpy()
+            less |= equal & (values < value)
+            equal &= values == value
+        return less
+
+    def last_key(frame, cols):
+        return tuple(frame[cols].iloc[-1]) if len(frame) else None
+
+    while True:
+        # Read until each side either has rows or is exhausted
+        while not left_done and not len(left_buf):
+            chunk = next(left_iter, None)
+            left_done = chunk is None
+            left_buf = left_buf if chunk is None else chunk
+        while not right_done and not len(right_buf):
+            chunk = next(right_iter, None)
+            right_done = chunk is None
+            right_buf = right_buf if chunk is None else chunk
+
+        bounds = [last_key(left_buf, left_on)] if not left_done else []
+        bounds += [last_key(right_buf, right_on)] if not right_done else []
+        if bounds:
+            boundary = min(bounds)
+            left_ready = before(left_buf, left_on, boundary)
+            right_ready = before(right_buf, right_on, boundary)
+        else:
+            left_ready = np.ones(len(left_buf), dtype=bool)
+            right_ready = np.ones(len(right_buf), dtype=bool)
+
+        if left_ready.any() or right_ready.any():
+            joined = pd.merge(left_buf[left_ready], right_buf[right_ready], how=how,
+                              on=merge_on, left_on=None if merge_on else left_on,
+                              right_on=None if merge_on else right_on, suffixes=suffixes)
+            if len(joined):
+                yield joined
+            left_buf, right_buf = left_buf[~left_ready], right_buf[~right_ready]
+
+        if not bounds:
+            return
+        # Pull more rows for every side whose last key is the boundary
+        if not left_done and last_key(left_buf, left_on) == boundary:
+            chunk = next(left_iter, None)
+            left_done = chunk is None
+            if chunk is not None:
+                left_buf = pd.concat([left_buf, chunk], ignore_index=True)
+        if not right_done and last_key(right_buf, right_on) == boundary:
+            chunk = next(right_iter, None)
+            right_done = chunk is None
+            if chunk is not None:
+                right_buf = pd.concat([right_buf, chunk], ignore_index=True)
@@ -0,0 +1,181 @@
+# Column Indexes for Repeated Filters
+
+'''
+Answers many filters against the same DataFrame without scanning whole columns:
+Sorted Index: An argsort of a column turns range filters (>, <=, between) into two binary searches.
+Hash Index: Rows grouped by value turn equality and isin filters into dictionary lookups.
+Combined Filters: The most selective indexed predicate picks the candidate rows; the others are checked on those rows only.
+Invalidation: Any change to an indexed column (or the frame's shape) is detected and the index is rebuilt on next use.
+'''
+
+import numpy as np
+import pandas as pd
+
+_RANGE_OPS = ('<', '<=', '>', '>=')
+_OPS = ('==', '!=', 'in', 'not in', 'between') + _RANGE_OPS
+
+
+def _as_list(columns):
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _token(series):
+    # Identifies the column's buffer. The index keeps a reference to the
+    # column, so under copy-on-write (default from pandas 3.0) any in-place
+    # write to the frame copies the buffer and changes this token.
+    values = series.array
+    if isinstance(values, pd.arrays.NumpyExtensionArray):
+        return series.to_numpy().__array_interface__['data'][0]
+    return id(values)
+
+
+class _SortedIndex:
+    def __init__(self, series):
+        valid = np.flatnonzero(series.notna().to_numpy())
+        values = series.to_numpy()[valid]
+        order = np.argsort(values, kind='stable')
+        self.order = valid[order]
+        self.values = values[order]
+
+    def bounds(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        start = 0 if low is None else int(np.searchsorted(
+            self.values, low, side='left' if low_inclusive else 'right'))
+        stop = len(self.values) if high is None else int(np.searchsorted(
+            self.values, high, side='right' if high_inclusive else 'left'))
+        return start, max(start, stop)
+
+    def slices(self, values):
+        # Repeated values (e.g. 'in' [30, 30.0]) map to the same slice; keep it once
+        return sorted({self.bounds(value, value) for value in values})
+
+
+class _HashIndex:
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self.uniques = pd.Index(uniques)
+        self.order = np.argsort(codes, kind='stable')
+        # Rows with code c are order[starts[c]:starts[c + 1]]; NaN (-1) sorts first
+        self.starts = np.searchsorted(codes[self.order], np.arange(len(uniques) + 1))
+
+    def slices(self, values):
+        codes = np.unique(self.uniques.get_indexer(values))
+        return [(self.starts[c], self.starts[c + 1]) for c in codes[codes >= 0]]
+
+
+def _tighten(bound, value, inclusive, pick):
+    # Narrow a (value, inclusive) range end; pick is max for lower ends, min for upper
+    if bound is None or pick(value, bound[0]) != bound[0]:
+        return value, inclusive
+    if value == bound[0]:
+        return value, inclusive and bound[1]
+    return bound
+
+
+def _evaluate(values, op, value):
+    if op == 'between':
+        mask = values.between(*value)
+    elif op in ('in', 'not in'):
+        mask = values.isin(value) if op == 'in' else ~values.isin(value)
+    else:
+        mask = {'==': values.__eq__, '!=': values.__ne__, '<': values.__lt__,
+                '<=': values.__le__, '>': values.__gt__, '>=': values.__ge__}[op](value)
+    return mask.to_numpy(dtype=bool, na_value=False)
+
+
+class ColumnIndex:
+    """Sorted and hash indexes over columns of one DataFrame.
+
+    sorted_on columns answer <, <=, >, >=, between (and ==, in); hashed_on
+    columns answer == and in. Results are row positions in frame order, or
+    the rows themselves via filter(). Indexes are built on first use and
+    rebuilt whenever the indexed column has been modified; without
+    copy-on-write (pandas < 3.0 default) call invalidate() after in-place edits.
+    """
+
+    def __init__(self, frame, sorted_on=(), hashed_on=()):
+        self.frame = frame
+        self._kinds = {col: 'sorted' for col in _as_list(sorted_on)}
+        self._kinds.update({col: 'hash' for col in _as_list(hashed_on)})
+        self._built = {}
+        self.builds = 0
+
+    def invalidate(self, columns=None):
+        for col in (list(self._built) if columns is None else _as_list(columns)):
+            self._built.pop(col, None)
+
+    def _index(self, col):
+        column = self.frame[col]
+        built = self._built.get(col)
+        if built is not None and built[0] == (len(column), _token(column)):
+            return built[2]
+        index = (_SortedIndex if self._kinds[col] == 'sorted' else _HashIndex)(column)
+        # Keep the column itself so a later write to the frame must copy it
+        self._built[col] = ((len(column), _token(column)), column, index)
+        self.builds += 1
+        return index
+
+    def _options(self, col, predicates):
+        # Ways to answer this column's predicates from its index, as
+        # (n_rows, index, slices of index.order, predicates answered)
+        kind = self._kinds.get(col)
+        if kind is None:
+            return []
+        index = self._index(col)
+        options = [(index, index.slices([value] if op == '==' else list(value)), [p])
+                   for p in predicates for _, op, value in [p] if op in ('==', 'in')]
+        if kind == 'sorted':
+            low = high = None
+            ranged = []
+            for p in predicates:
+                _, op, value = p
+                if op in ('>', '>=', 'between'):
+                    low = _tighten(low, value[0] if op == 'between' else value, op != '>', max)
+                if op in ('<', '<=', 'between'):
+                    high = _tighten(high, value[1] if op == 'between' else value, op != '<', min)
+                if op in _RANGE_OPS + ('between',):
+                    ranged.append(p)
+            if ranged:
+                low, low_inclusive = low or (None, True)
+                high, high_inclusive = high or (None, True)
+                options.append((index, [index.bounds(low, high, low_inclusive, high_inclusive)],
+                                ranged))
+        return [(sum(stop - start for start, stop in slices), index, slices, answered)
+                for index, slices, answered in options]
+
+    def positions(self, *predicates):
+        """Row positions matching all (column, op, value) predicates.
+
+        op is one of ==, !=, <, <=, >, >=, in, not in, between (value is a
+        (low, high) pair, inclusive). The indexed predicate (or merged range
+        on one sorted column) matching the fewest rows is answered from its
+        index in O(log n); the other predicates are checked on those rows only.
+        """
+        for _, op, _ in predicates:
+            if op not in _OPS:
+                raise ValueError(f"unsupported operator {op!r}; use one of {_OPS}")
+        by_column = {}
+        for p in predicates:
+            by_column.setdefault(p[0], []).append(p)
+        options = [option for col, preds in by_column.items()
+                   for option in self._options(col, preds)]
+
+        if options:
+            _, index, slices, answered = min(options, key=lambda option: option[0])
+            pieces = [index.order[start:stop] for start, stop in slices]
+            candidates = np.sort(np.concatenate(pieces)) if pieces else np.empty(0, np.intp)
+        else:
+            candidates, answered = np.arange(len(self.frame)), []
+        for p in predicates:
+            if any(p is a for a in answered) or not len(candidates):
+                continue
+            col, op, value = p
+            candidates = candidates[_evaluate(self.frame[col].iloc[candidates], op, value)]
+        return candidates
+
+    def filter(self, *predicates):
+        """The rows matching all predicates, like frame[mask] with the same order."""
+        return self.frame.iloc[self.positions(*predicates)]
+
+    def lookup(self, col, value):
+        """Rows whose `col` equals value (e.g. one employee by Name)."""
+        return self.filter((col, '==', value))
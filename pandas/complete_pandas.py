@@ -15,17 +15,22 @@ Statistics: Summary statistics and value counts.
 Pivot Tables: Creating pivot tables for grouped data.
 Reshaping: Melting and pivoting data.
 Handling Duplicates: Removing duplicates from a DataFrame.
-Exporting Data: Exporting DataFrames to CSV.
+Exporting Data: Exporting DataFrames to CSV, Parquet and Feather.
 '''
 
 # Import pandas
 import pandas as pd
-import numpy as np
 
 # 1. Data Loading
 # Read a CSV file
 # df = pd.read_csv('your_file.csv')
 
+# Read a large CSV file in typed chunks (categoricals, downcast numbers),
+# parsing only the needed columns and filtering rows chunk by chunk
+# from csv_loader import load_csv, iter_csv
+# df = load_csv('your_file.csv', usecols=['Name', 'Age', 'Salary'], where=lambda chunk: chunk['Age'] > 30)
+# for chunk in iter_csv('your_file.csv', chunksize=1_000_000): ...
+
 # Creating DataFrames directly (example)
 data = {'Name': ['Alice', 'Bob', 'Charlie', 'David'],
         'Age': [25, 30, 35, 40],
@@ -49,15 +54,23 @@ print("\nSelect rows where Age > 30 (loc):\n", df.loc[df['Age'] > 30])
 
 # 3. Data Cleaning
 # Handling missing data
-df_with_nan = df.copy()
-df_with_nan.loc[1, 'Salary'] = np.nan
+# (assign replaces only the Salary column instead of copying the whole frame)
+df_with_nan = df.assign(Salary=df['Salary'].where(df.index != 1))
 print("\nDataFrame with NaN:\n", df_with_nan)
 
 # Drop rows with missing values
 print("\nDrop rows with NaN:\n", df_with_nan.dropna())
 
 # Fill missing values
-print("\nFill NaN with mean salary:\n", df_with_nan.fillna(df_with_nan['Salary'].mean()))
+print("\nFill NaN with mean salary:\n", df_with_nan.fillna({'Salary': df_with_nan['Salary'].mean()}))
+
+# Fill with per-group statistics ('mean', 'median' or 'ffill' within groups); groups
+# without any value fall back to the overall statistic. fit() also accepts chunks,
+# and iter_transform() fills chunk by chunk.
+from impute import GroupImputer
+df_with_nan['Level'] = ['Junior', 'Junior', 'Senior', 'Senior']
+imputer = GroupImputer('mean', by='Level', columns=['Salary'])
+print("\nFill NaN with mean salary per level:\n", imputer.fit_transform(df_with_nan))
 
 # Replace specific values
 print("\nReplace 'Alice' with 'Alicia':\n", df.replace({'Alice': 'Alicia'}))
@@ -84,6 +97,13 @@ print("\nGrouped by Age with mean Salary:\n", grouped)
 agg_multi = df.groupby('Age').agg({'Salary': ['mean', 'sum', 'max']})
 print("\nGrouped by Age with multiple aggregations:\n", agg_multi)
 
+# Same aggregation over chunks, for data larger than memory
+# (chunks could come from csv_loader.iter_csv; n_jobs > 1 reduces them in worker processes)
+from chunked_agg import aggregate
+chunks = (df.iloc[i:i + 2] for i in range(0, len(df), 2))
+agg_chunked = aggregate(chunks, 'Age', {'Salary': ['mean', 'sum', 'max']})
+print("\nChunked aggregation (same result):\n", agg_chunked)
+
 # 6. Merging and Joining DataFrames
 # Creating another DataFrame for merge example
 data2 = {'Employee': ['Alice', 'Bob', 'Eve', 'Frank'],
@@ -94,6 +114,14 @@ df2 = pd.DataFrame(data2)
 merged_df = pd.merge(df, df2, left_on='Name', right_on='Employee', how='left')
 print("\nMerged DataFrame (left join on 'Employee'):\n", merged_df)
 
+# Large joins: partition both sides by key hash to disk and join one partition at a time
+# (inputs can also be chunk iterators; merge_sorted streams inputs already sorted by key)
+from chunked_join import hash_join
+merged_large, spill_stats = hash_join(df, df2, how='left', left_on='Name', right_on='Employee',
+                                      n_partitions=4)
+print("\nHash-partitioned join (same rows as pd.merge):\n", merged_large)
+print("Spill statistics:", spill_stats)
+
 # 7. Sorting
 # Sorting by column values
 sorted_df = df.sort_values(by='Salary', ascending=False)
@@ -108,6 +136,27 @@ print("\nDataFrame sorted by index (descending):\n", sorted_index_df)
 filtered_df = df[df['Salary'] > 60000]
 print("\nFilter rows where Salary > 60000:\n", filtered_df)
 
+# Many filters against the same frame: build sorted/hash indexes once and answer
+# each filter with binary searches or lookups instead of scanning the column
+# (the index rebuilds itself after the frame is modified)
+from column_index import ColumnIndex
+index = ColumnIndex(df, sorted_on=['Salary', 'Age'], hashed_on='Name')
+print("\nIndexed filter Salary > 60000:\n", index.filter(('Salary', '>', 60000)))
+print("\nIndexed filter Age > 30 and Name in [Charlie, Eve]:\n",
+      index.filter(('Age', '>', 30), ('Name', 'in', ['Charlie', 'Eve'])))
+
+# Lazy chains: steps are recorded and run once on collect(); filters are fused and
+# applied first, and filter/sort/select end in a single take instead of a copy per step
+# (LazyFrame.scan_csv / scan_table also push the columns and filters into the reader)
+from lazy_frame import LazyFrame
+query = (LazyFrame(df)
+         .filter(('Age', '>', 30))
+         .filter('Salary > 60000')
+         .sort('Salary', ascending=False)
+         .select(['Name', 'Salary']))
+print("\nLazy query plan:\n", query.explain())
+print("\nLazy query result:\n", query.collect())
+
 # 9. Statistics
 # Summary statistics for numerical columns
 print("\nSummary statistics:\n", df.describe())
@@ -120,6 +169,13 @@ print("\nValue counts for 'Age' column:\n", df['Age'].value_counts())
 pivot = df.pivot_table(values='Salary', index='Age', columns='Name', aggfunc='mean')
 print("\nPivot Table:\n", pivot)
 
+# Same pivot storing only non-empty cells (pandas sparse columns, or a scipy.sparse
+# matrix with output='csr'); useful when columns= has many distinct values
+from sparse_reshape import sparse_pivot, iter_melt
+sparse_pivot_df = sparse_pivot(df, index='Age', columns='Name', values='Salary', aggfunc='mean')
+print("\nSparse Pivot Table (density {:.0%}):\n".format(sparse_pivot_df.sparse.density),
+      sparse_pivot_df)
+
 # 11. Reshaping
 # Melting a DataFrame (long format)
 melted_df = pd.melt(df, id_vars=['Name'], value_vars=['Age', 'Salary'])
@@ -129,18 +185,41 @@ print("\nMelted DataFrame:\n", melted_df)
 pivoted_df = melted_df.pivot(index='Name', columns='variable', values='value')
 print("\nPivoted DataFrame:\n", pivoted_df)
 
+# Melting chunk by chunk, then pivoting back without a dense intermediate
+melted_chunks = iter_melt((df.iloc[i:i + 2] for i in range(0, len(df), 2)),
+                          id_vars=['Name'], value_vars=['Age', 'Salary'])
+pivoted_sparse = sparse_pivot(pd.concat(melted_chunks), index='Name', columns='variable',
+                              values='value', aggfunc=None)
+print("\nPivoted from melted chunks (sparse):\n", pivoted_sparse)
+
 # 12. Handling Duplicates
 # Adding duplicate data for demonstration
-df_dup = df.append(df.iloc[0])
+df_dup = pd.concat([df, df.iloc[[0]]])
 print("\nDataFrame with duplicate rows:\n", df_dup)
 
 # Dropping duplicate rows
 df_no_dup = df_dup.drop_duplicates()
 print("\nDataFrame with duplicates removed:\n", df_no_dup)
 
+# Dropping duplicates across chunks: rows are hashed to 64-bit fingerprints and
+# checked against a compact seen-set (bloom_capacity adds a Bloom filter pre-check)
+from dedup import drop_duplicates_stream
+dedup_stats = {}
+chunks = (df_dup.iloc[i:i + 2] for i in range(0, len(df_dup), 2))
+df_no_dup_stream = pd.concat(drop_duplicates_stream(chunks, stats=dedup_stats))
+print("\nStreaming deduplication (same rows as drop_duplicates):\n", df_no_dup_stream)
+print("Deduplication statistics:", dedup_stats)
+
 # 13. Exporting Data
 # Export DataFrame to CSV
 # df.to_csv('exported_file.csv', index=False)
 
 print("\nDataFrame can be exported to CSV with `df.to_csv('exported_file.csv')`")
 
+# Columnar formats are faster to write and read and smaller on disk; rows can be
+# partitioned into one directory per value, and reads load only the needed columns/partitions
+# from columnar_io import write_table, read_table, benchmark_formats
+# write_table(merged_df, 'exported_dataset', format='parquet', compression='zstd', partition_cols='Department')
+# hr = read_table('exported_dataset', columns=['Name', 'Salary'], filters=[('Department', '==', 'HR')])
+# print(benchmark_formats(large_df))  # CSV vs Parquet/Feather write time, read time and size
+
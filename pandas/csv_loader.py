@@ -0,0 +1,121 @@
+# Chunked, Typed CSV Loading
+
+'''
+A memory-conscious replacement for pd.read_csv('your_file.csv') on large files:
+Schema Inference: A sample of rows decides each column's dtype once.
+Compact Dtypes: Low-cardinality strings become categoricals, ints are downcast, floats only when float32 keeps their values.
+Projection: Only the requested columns are parsed (usecols).
+Row Filters: A predicate is applied to every chunk as soon as it is read.
+Chunks or Frame: iter_csv yields chunks, load_csv concatenates them.
+'''
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+def infer_schema(path, sample_rows=100_000, usecols=None, category_ratio=0.5,
+                 max_categories=10_000, downcast_floats=True, **read_kwargs):
+    """Infer a {column: dtype} schema from the first sample_rows rows.
+
+    Strings with few distinct values (at most category_ratio of the rows and
+    max_categories in total) become 'category'. Integers get the smallest
+    dtype holding the sample's range (widened later if needed); floats become
+    float32 when downcast_floats is set and the sample survives the cast
+    (as pd.to_numeric(downcast='float') decides), otherwise float64.
+    """
+    sample = pd.read_csv(path, nrows=sample_rows, usecols=usecols, **read_kwargs)
+    schema = {}
+    for col in sample.columns:
+        values = sample[col]
+        if pd.api.types.is_bool_dtype(values):
+            schema[col] = 'bool'
+        elif pd.api.types.is_integer_dtype(values):
+            schema[col] = pd.to_numeric(values, downcast='integer').dtype.name
+        elif pd.api.types.is_float_dtype(values):
+            schema[col] = pd.to_numeric(values, downcast='float').dtype.name \
+                if downcast_floats else 'float64'
+        elif pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            distinct = values.nunique(dropna=True)
+            if distinct <= max_categories and distinct <= category_ratio * max(len(values), 1):
+                schema[col] = 'category'
+            else:
+                schema[col] = values.dtype.name
+        else:
+            schema[col] = values.dtype.name
+    return schema
+
+
+def _fit_numbers(chunk, schema):
+    # Numbers are parsed at 64 bits and narrowed here; if a chunk exceeds the
+    # pinned integer range (or gains missing values), or its floats would
+    # lose precision as float32, the schema is widened in place.
+    for col, dtype in schema.items():
+        if col not in chunk:
+            continue
+        values = chunk[col]
+        if dtype == 'float32':
+            if pd.to_numeric(values, downcast='float').dtype != np.float32:
+                schema[col] = 'float64'
+            chunk[col] = values.astype(schema[col])
+            continue
+        if not pd.api.types.is_integer_dtype(dtype):
+            continue
+        if not pd.api.types.is_integer_dtype(values):
+            schema[col] = 'float64'
+            continue
+        info = np.iinfo(dtype)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            schema[col] = pd.to_numeric(
+                pd.Series([values.min(), values.max(), info.min, info.max]),
+                downcast='integer').dtype.name
+        chunk[col] = values.astype(schema[col])
+    return chunk
+
+
+def iter_csv(path, chunksize=1_000_000, usecols=None, schema=None, where=None,
+             **read_kwargs):
+    """Yield typed DataFrame chunks of a CSV file.
+
+    `schema` defaults to infer_schema(path, usecols=usecols). `where` is a
+    function taking a chunk and returning a boolean mask (or a query string);
+    rows failing it are dropped before the next chunk is read.
+    """
+    if schema is None:
+        schema = infer_schema(path, usecols=usecols, **read_kwargs)
+    schema = dict(schema)
+    if usecols is None:
+        usecols = list(schema)
+
+    # Categories and other dtypes can be pinned in the parser itself; numbers
+    # are narrowed per chunk so an out-of-range value cannot fail the read
+    # and a float the sample did not cover cannot be silently rounded.
+    parse_dtypes = {col: 'float64' if dtype == 'float32' else dtype
+                    for col, dtype in schema.items()
+                    if not pd.api.types.is_integer_dtype(dtype)}
+
+    with pd.read_csv(path, usecols=usecols, dtype=parse_dtypes, chunksize=chunksize,
+                     **read_kwargs) as reader:
+        for chunk in reader:
+            chunk = _fit_numbers(chunk, schema)
+            if where is not None:
+                chunk = chunk.query(where) if isinstance(where, str) else chunk[where(chunk)]
+            yield chunk
+
+
+def load_csv(path, chunksize=1_000_000, usecols=None, schema=None, where=None,
+             **read_kwargs):
+    """Read a CSV through iter_csv and return one DataFrame.
+
+    Categorical columns are unified across chunks so they stay categorical.
+    """
+    chunks = list(iter_csv(path, chunksize, usecols, schema, where, **read_kwargs))
+    if not chunks:
+        return pd.read_csv(path, usecols=usecols, nrows=0, **read_kwargs)
+
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            categories = union_categoricals([chunk[col] for chunk in chunks]).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,230 @@
+# Streaming Deduplication
+
+'''
+drop_duplicates() for data that arrives in chunks:
+Fingerprints: Each row (or a subset of columns) is hashed to one 64-bit integer.
+Compact Seen-set: Fingerprints are kept in a sorted NumPy array, 8 bytes per distinct row.
+Bloom Filter: Optional pre-check that skips most lookups, or replaces the exact set to bound memory.
+keep='first', 'last' or False: Same choices as drop_duplicates; 'last' and False read the input twice.
+'''
+
+import numpy as np
+import pandas as pd
+
+
+_EXACT_INT = 2 ** 53  # larger integers are not exact in float64
+
+
+def _column_hashes(values):
+    # Numbers are hashed as float64 so 1 and 1.0 (or int32 and int64) match,
+    # as they do in drop_duplicates; per-chunk dtype inference (a NaN turning
+    # an int column float) would otherwise hide duplicates across chunks.
+    # Integers too large for float64 keep their integer hash, so distinct
+    # values never merge.
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return pd.util.hash_pandas_object(values, index=False).to_numpy()
+    floats = pd.Series(values.to_numpy(dtype=np.float64, na_value=np.nan))
+    hashes = pd.util.hash_pandas_object(floats, index=False).to_numpy(copy=True)
+    if pd.api.types.is_integer_dtype(values):
+        large = (values.abs() > _EXACT_INT).to_numpy(dtype=bool, na_value=False)
+        if large.any():
+            hashes[large] = pd.util.hash_pandas_object(values[large], index=False).to_numpy()
+    return hashes
+
+
+def row_fingerprints(frame, subset=None):
+    """64-bit hash of every row (of the `subset` columns), ignoring the index.
+
+    Numeric columns hash by value, whatever their dtype. Two different rows
+    collide with probability about n^2 / 2^65 over n distinct rows, i.e.
+    small but not zero at billions of rows.
+    """
+    if subset is not None:
+        frame = frame[[subset] if isinstance(subset, str) else list(subset)]
+    hashes = pd.DataFrame({i: _column_hashes(frame.iloc[:, i]) for i in range(frame.shape[1])})
+    return pd.util.hash_pandas_object(hashes, index=False).to_numpy()
+
+
+class FingerprintSet:
+    """Set of uint64 fingerprints stored as a sorted array plus a small buffer."""
+
+    def __init__(self):
+        self._sorted = np.empty(0, dtype=np.uint64)
+        self._buffer = []
+        self._buffered = 0
+
+    def __len__(self):
+        return len(self._sorted) + self._buffered
+
+    @property
+    def nbytes(self):
+        return self._sorted.nbytes + self._buffered * 8
+
+    @staticmethod
+    def _lookup(table, fingerprints):
+        if not len(table):
+            return np.zeros(len(fingerprints), dtype=bool)
+        pos = np.minimum(np.searchsorted(table, fingerprints), len(table) - 1)
+        return table[pos] == fingerprints
+
+    def _flush(self):
+        if self._buffer:
+            self._sorted = np.sort(np.concatenate([self._sorted] + self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def contains(self, fingerprints):
+        """Boolean mask of which fingerprints are already in the set."""
+        # Re-sorting is amortized: the buffer is merged only once it has grown
+        # to a fraction of the sorted array
+        if self._buffered > max(1 << 16, len(self._sorted) // 8):
+            self._flush()
+        if len(self._buffer) > 1:
+            self._buffer = [np.sort(np.concatenate(self._buffer))]
+        found = self._lookup(self._sorted, fingerprints)
+        if self._buffer:
+            found |= self._lookup(self._buffer[0], fingerprints)
+        return found
+
+    def add(self, fingerprints):
+        """Add fingerprints that are not yet in the set (no duplicates among them)."""
+        self._buffer.append(np.sort(np.asarray(fingerprints, dtype=np.uint64)))
+        self._buffered += len(fingerprints)
+
+
+class BloomFilter:
+    """Bloom filter over uint64 fingerprints, sized for capacity and error_rate."""
+
+    def __init__(self, capacity, error_rate=1e-6):
+        n_bits = int(np.ceil(-capacity * np.log(error_rate) / np.log(2) ** 2))
+        self.n_bits = max(n_bits, 64)
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * np.log(2))))
+        self._bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+
+    @property
+    def nbytes(self):
+        return self._bits.nbytes
+
+    def _positions(self, fingerprints):
+        # Double hashing: position_i = h1 + i * h2, from the two 32-bit halves
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        h1 = fingerprints & np.uint64(0xFFFFFFFF)
+        h2 = (fingerprints >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(self.n_hashes, dtype=np.uint64)
+        return (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(self.n_bits)
+
+    def might_contain(self, fingerprints):
+        """False means definitely never added; True means probably added."""
+        pos = self._positions(fingerprints)
+        bits = (self._bits[pos >> np.uint64(3)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+    def add(self, fingerprints):
+        pos = self._positions(fingerprints).ravel()
+        np.bitwise_or.at(self._bits, pos >> np.uint64(3),
+                         (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)))
+
+
+def _first_in_chunk(fingerprints):
+    # Mask of the first occurrence of each fingerprint within one chunk
+    _, first = np.unique(fingerprints, return_index=True)
+    mask = np.zeros(len(fingerprints), dtype=bool)
+    mask[first] = True
+    return mask
+
+
+def _iter_chunks(source, replayable=False):
+    # replayable: the source will be read again, so a one-shot iterator is an error
+    if replayable and not isinstance(source, (pd.DataFrame, list, tuple)) and not callable(source):
+        raise TypeError("keep='last' and keep=False read the chunks twice; pass a DataFrame, "
+                        "a list/tuple of chunks, or a function returning a fresh iterator")
+    if isinstance(source, pd.DataFrame):
+        return iter([source])
+    if callable(source):
+        return iter(source())
+    return iter(source)
+
+
+def drop_duplicates_stream(chunks, subset=None, keep='first', bloom_capacity=None,
+                           error_rate=1e-6, exact=True, stats=None):
+    """Yield chunks with duplicate rows removed across the whole stream.
+
+    keep='first' makes one pass. keep='last' and keep=False make two passes,
+    so `chunks` must then be a DataFrame, a list/tuple, or a function
+    returning a fresh iterator (e.g. lambda: iter_csv(path)); anything else
+    raises TypeError.
+
+    With bloom_capacity set (keep='first' only), a Bloom filter sized for
+    that many distinct rows screens fingerprints first; with exact=False it is the only seen-set,
+    which bounds memory at the cost of dropping about error_rate of the
+    unique rows. Pass a dict as `stats` to receive row counts and memory use.
+    """
+    if keep not in ('first', 'last', False):
+        raise ValueError("keep must be 'first', 'last' or False")
+    if keep != 'first' and (bloom_capacity is not None or not exact):
+        raise ValueError("bloom_capacity and exact only apply to keep='first'")
+    if not exact and bloom_capacity is None:
+        raise ValueError("exact=False needs bloom_capacity")
+    stats = {} if stats is None else stats
+    stats.update(rows_in=0, rows_out=0)
+
+    if keep == 'first':
+        yield from _keep_first(chunks, subset, bloom_capacity, error_rate, exact, stats)
+    else:
+        yield from _keep_last_or_none(chunks, subset, keep, stats)
+
+
+def _keep_first(chunks, subset, bloom_capacity, error_rate, exact, stats):
+    seen = FingerprintSet() if exact else None
+    bloom = BloomFilter(bloom_capacity, error_rate) if bloom_capacity else None
+    for chunk in _iter_chunks(chunks):
+        fingerprints = row_fingerprints(chunk, subset)
+        keep = _first_in_chunk(fingerprints)
+
+        candidates = np.flatnonzero(keep)
+        if bloom is not None:
+            # Only fingerprints the Bloom filter may have seen need an exact lookup
+            maybe = bloom.might_contain(fingerprints[candidates])
+            if seen is None:
+                keep[candidates[maybe]] = False
+            candidates = candidates[maybe]
+        if seen is not None and len(candidates):
+            keep[candidates[seen.contains(fingerprints[candidates])]] = False
+
+        new = fingerprints[keep]
+        if seen is not None:
+            seen.add(new)
+        if bloom is not None:
+            bloom.add(new)
+
+        stats['rows_in'] += len(chunk)
+        stats['rows_out'] += int(keep.sum())
+        stats['seen_bytes'] = (seen.nbytes if seen is not None else 0) + \
+            (bloom.nbytes if bloom is not None else 0)
+        yield chunk[keep]
+
+
+def _keep_last_or_none(chunks, subset, keep, stats):
+    # Pass 1: fingerprint every row, then decide globally which rows survive
+    fingerprints = np.concatenate([row_fingerprints(chunk, subset)
+                                   for chunk in _iter_chunks(chunks, replayable=True)] or
+                                  [np.empty(0, dtype=np.uint64)])
+    n = len(fingerprints)
+    if keep == 'last':
+        _, last_from_end = np.unique(fingerprints[::-1], return_index=True)
+        survivors = np.zeros(n, dtype=bool)
+        survivors[n - 1 - last_from_end] = True
+    else:
+        _, inverse, counts = np.unique(fingerprints, return_inverse=True, return_counts=True)
+        survivors = counts[inverse] == 1
+    del fingerprints
+    stats['seen_bytes'] = n * 9
+
+    # Pass 2: stream the rows again and apply the decision
+    offset = 0
+    for chunk in _iter_chunks(chunks, replayable=True):
+        mask = survivors[offset:offset + len(chunk)]
+        offset += len(chunk)
+        stats['rows_in'] += len(chunk)
+        stats['rows_out'] += int(mask.sum())
+        yield chunk[mask]
@@ -0,0 +1,168 @@
+# Group-aware Imputation
+
+'''
+fillna with statistics learned per group, for many columns at once:
+Strategies: Group mean, group median, or forward fill within each group.
+One Pass: All columns' group statistics come from a single groupby; fills are vectorized lookups.
+Fallback: Rows of groups with no observed value (or groups unseen at fit time) get the overall statistic.
+Streaming: fit() accepts chunks (via chunked_agg) and iter_transform() fills chunk by chunk,
+carrying forward-fill values across chunk boundaries.
+No Full Copy: Only the columns that contain missing values are replaced; the rest are shared.
+'''
+
+import numpy as np
+import pandas as pd
+
+from chunked_agg import finalize, merge_partials, partial_aggregate
+
+_STRATEGIES = ('mean', 'median', 'ffill')
+
+
+def _as_list(columns):
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _keys(frame, by):
+    return pd.Index(frame[by[0]]) if len(by) == 1 else pd.MultiIndex.from_frame(frame[by])
+
+
+class GroupImputer:
+    """Fill missing values with per-group means or medians, or forward fill within groups.
+
+    by is the grouping column(s) (None for whole-column statistics); columns
+    defaults to every numeric column except `by` (every column for 'ffill').
+    """
+
+    def __init__(self, strategy='mean', by=None, columns=None):
+        if strategy not in _STRATEGIES:
+            raise ValueError(f"strategy must be one of {_STRATEGIES}")
+        self.strategy = strategy
+        self.by = None if by is None else _as_list(by)
+        self.columns = None if columns is None else _as_list(columns)
+        self.group_stats_ = None
+        self.global_stats_ = None
+
+    def _columns(self, frame):
+        if self.columns is not None:
+            return self.columns
+        columns = [col for col in frame.columns if col not in (self.by or [])]
+        if self.strategy != 'ffill':
+            columns = [col for col in columns if pd.api.types.is_numeric_dtype(frame[col])
+                       and not pd.api.types.is_bool_dtype(frame[col])]
+        return columns
+
+    def fit(self, data, merge_every=32):
+        """Learn the statistics from a DataFrame or an iterable of chunks.
+
+        Chunks are reduced with chunked_agg partials, merged every merge_every
+        chunks: means are exact, medians come from its quantile sketch.
+        'ffill' has nothing to learn.
+        """
+        if self.strategy == 'ffill':
+            return self
+        if isinstance(data, pd.DataFrame):
+            columns = self._columns(data)
+            self.global_stats_ = data[columns].agg(self.strategy)
+            if self.by:
+                self.group_stats_ = data.groupby(self.by)[columns].agg(self.strategy)
+            return self
+
+        spec = None
+        groups, overall = [], []
+        for chunk in data:
+            if spec is None:
+                spec = {col: self.strategy for col in self._columns(chunk)}
+            # Per-group and overall partials from the same pass over the chunks
+            if self.by:
+                groups.append(partial_aggregate(chunk, self.by, spec))
+            overall.append(partial_aggregate(chunk.assign(__all=0), '__all', spec))
+            if len(overall) >= merge_every:
+                groups[:] = [merge_partials(groups)] if groups else []
+                overall[:] = [merge_partials(overall)]
+        if spec is None:
+            raise ValueError("no chunks to fit")
+        self.global_stats_ = finalize(merge_partials(overall), spec).iloc[0]
+        if self.by:
+            self.group_stats_ = finalize(merge_partials(groups), spec)
+        return self
+
+    def _fill_statistics(self, frame, out):
+        positions = None
+        for col in self._columns(frame):
+            values = frame[col]
+            missing = values.isna().to_numpy()
+            if not missing.any():
+                continue
+            fill = np.full(missing.sum(), self.global_stats_[col], dtype=np.float64)
+            if self.group_stats_ is not None:
+                # One hash lookup of every row's group, shared by all columns
+                if positions is None:
+                    positions = self.group_stats_.index.get_indexer(_keys(frame, self.by))
+                rows = positions[missing]
+                seen = rows >= 0
+                group_fill = self.group_stats_[col].to_numpy(np.float64)[rows[seen]]
+                fill[seen] = np.where(np.isnan(group_fill), fill[seen], group_fill)
+            dtype = np.float32 if values.dtype == np.float32 else np.float64
+            filled = values.to_numpy(dtype=dtype, na_value=np.nan, copy=True)
+            filled[missing] = fill
+            out[col] = pd.Series(filled, index=frame.index)
+
+    def _forward_fill(self, frame, out, carry):
+        # carry is a dict holding each group's last value between chunks (None: one frame)
+        columns = self._columns(frame)
+        if carry is None:
+            columns = [col for col in columns if frame[col].hasnans]
+        if not columns or not len(frame):
+            return
+        groups = [frame[col] for col in self.by] if self.by else None
+        source = frame[columns].groupby(groups, sort=False, dropna=False) if self.by else frame[columns]
+        filled = source.ffill()
+        if carry is not None:
+            last = carry.get('last')
+            if last is not None:
+                # Values still missing at the start of a group come from earlier chunks
+                if self.by:
+                    previous = last.reindex(_keys(frame, self.by)).set_axis(frame.index)
+                    filled = filled.fillna(previous)
+                else:
+                    filled = filled.fillna(last)
+            if self.by:
+                current = filled.groupby(groups, sort=False, dropna=False).last()
+                carry['last'] = current if last is None else current.combine_first(last)
+            else:
+                carry['last'] = filled.iloc[-1]
+        for col in columns:
+            if frame[col].hasnans:
+                out[col] = filled[col]
+
+    def transform(self, frame, inplace=False):
+        """Return `frame` with missing values filled.
+
+        Only columns that had missing values are replaced, on a shallow copy
+        (or on `frame` itself with inplace=True), so unchanged columns are
+        never copied.
+        """
+        if self.strategy != 'ffill' and self.global_stats_ is None:
+            raise ValueError("call fit() first")
+        out = frame if inplace else frame.copy(deep=False)
+        if self.strategy == 'ffill':
+            self._forward_fill(frame, out, carry=None)
+        else:
+            self._fill_statistics(frame, out)
+        return out
+
+    def fit_transform(self, frame, inplace=False):
+        return self.fit(frame).transform(frame, inplace=inplace)
+
+    def iter_transform(self, chunks, inplace=False):
+        """Yield filled chunks; forward fill continues across chunk boundaries."""
+        carry = {}
+        for chunk in chunks:
+            out = chunk if inplace else chunk.copy(deep=False)
+            if self.strategy == 'ffill':
+                self._forward_fill(chunk, out, carry)
+            else:
+                if self.global_stats_ is None:
+                    raise ValueError("call fit() first")
+                self._fill_statistics(chunk, out)
+            yield out
@@ -0,0 +1,244 @@
+# Lazy Query Plans
+
+'''
+Filter / select / sort / groupby chains that run once, on .collect():
+Recorded Plan: Each method returns a new LazyFrame with one more step; nothing is computed.
+Fused Filters: Consecutive filters become one boolean mask, and filters move ahead of sorts and selections.
+Single Take: Filtering, sorting and column selection end in one row/column take instead of a copy per step.
+Pushdown: Only the needed columns are read, and filters run while scanning csv_loader chunks or Parquet files.
+Streaming GroupBy: A groupby right after the scan is aggregated chunk by chunk with chunked_agg.
+'''
+
+import operator
+
+import numpy as np
+import pandas as pd
+
+from chunked_agg import aggregate
+from columnar_io import iter_table, read_table
+from csv_loader import iter_csv, load_csv
+
+_COMPARISONS = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge,
+    'in': lambda values, other: values.isin(other),
+    'not in': lambda values, other: ~values.isin(other),
+}
+# Aggregations chunked_agg computes exactly (its quantiles are approximate)
+_STREAMING_AGGS = ('count', 'sum', 'mean', 'min', 'max', 'var', 'std')
+
+
+def _as_list(columns):
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _mask(frame, predicates):
+    # AND of all predicates: (column, op, value) tuples, query strings or callables
+    mask = np.ones(len(frame), dtype=bool)
+    for predicate in predicates:
+        if isinstance(predicate, tuple):
+            col, op, value = predicate
+            result = _COMPARISONS[op](frame[col], value)
+        elif isinstance(predicate, str):
+            result = frame.eval(predicate)
+        else:
+            result = predicate(frame)
+        if isinstance(result, pd.Series):
+            result = result.to_numpy(dtype=bool, na_value=False)
+        mask &= np.asarray(result, dtype=bool)
+    return mask
+
+
+def _needed_columns(steps):
+    # Walk the plan backwards; None means every column may be needed
+    need = None
+    for step in reversed(steps):
+        kind = step[0]
+        if kind == 'select':
+            need = dict.fromkeys(step[1])
+        elif kind == 'groupby':
+            need = dict.fromkeys(step[1] + list(step[2]))
+        elif need is None:
+            continue
+        elif kind == 'sort':
+            need.update(dict.fromkeys(step[1]))
+        elif kind == 'filter':
+            if not isinstance(step[1], tuple):
+                # Callables and query strings may read any column
+                need = None
+            else:
+                need[step[1][0]] = None
+    return None if need is None else list(need)
+
+
+def _stages(steps):
+    # Split the plan at groupby/head; within each 'rows' stage filters commute
+    # with selections and sorts, so they are fused and applied first
+    stages, current = [], []
+    for step in steps + [('end',)]:
+        if step[0] in ('filter', 'select', 'sort'):
+            current.append(step)
+            continue
+        if current:
+            stages.append(('rows',
+                           [s[1] for s in current if s[0] == 'filter'],
+                           [s[1:] for s in current if s[0] == 'sort'],
+                           next((s[1] for s in reversed(current) if s[0] == 'select'), None)))
+            current = []
+        if step[0] != 'end':
+            stages.append(step)
+    return stages
+
+
+def _run_rows(frame, filters, sorts, columns):
+    positions = np.flatnonzero(_mask(frame, filters)) if filters else None
+    for by, ascending, na_position in sorts:
+        # Only the key columns of the surviving rows are sorted
+        keys = frame[by] if positions is None else frame[by].iloc[positions]
+        order = keys.reset_index(drop=True).sort_values(
+            by, ascending=ascending, kind='stable', na_position=na_position).index.to_numpy()
+        positions = order if positions is None else positions[order]
+    if positions is None:
+        return frame if columns is None else frame[columns]
+    col_positions = slice(None) if columns is None else frame.columns.get_indexer(columns)
+    return frame.iloc[positions, col_positions]
+
+
+class LazyGroupBy:
+    """Result of LazyFrame.groupby; call .agg() to add the aggregation to the plan."""
+
+    def __init__(self, lazy, by, sort):
+        self._lazy, self._by, self._sort = lazy, by, sort
+
+    def agg(self, spec):
+        """spec is a dict of column -> function name(s), as for DataFrame.agg."""
+        return self._lazy._then(('groupby', self._by, dict(spec), self._sort))
+
+
+class LazyFrame:
+    """A DataFrame query that is recorded now and executed by collect()."""
+
+    def __init__(self, frame=None, _source=None, _steps=()):
+        self._source = _source if _source is not None else ('frame', frame, {})
+        self._steps = list(_steps)
+
+    @classmethod
+    def scan_csv(cls, path, chunksize=1_000_000, schema=None, **read_kwargs):
+        """Lazy CSV source read through csv_loader with pushed-down columns and filters."""
+        return cls(_source=('csv', path, dict(chunksize=chunksize, schema=schema, **read_kwargs)))
+
+    @classmethod
+    def scan_table(cls, path, format='parquet', batch_size=1_000_000):
+        """Lazy Parquet/Feather source written by columnar_io.write_table."""
+        return cls(_source=('table', path, dict(format=format, batch_size=batch_size)))
+
+    def _then(self, step):
+        return LazyFrame(_source=self._source, _steps=self._steps + [step])
+
+    def filter(self, predicate):
+        """Keep rows matching predicate.
+
+        `predicate` is a (column, op, value) tuple such as ('Age', '>', 30)
+        (op: ==, !=, <, <=, >, >=, in, not in), a query string, or a function
+        of the frame returning a mask. Tuples allow column pruning and are
+        passed to Parquet/Feather scans as partition and row-group filters.
+        """
+        return self._then(('filter', predicate))
+
+    def select(self, columns):
+        return self._then(('select', _as_list(columns)))
+
+    def sort(self, by, ascending=True, na_position='last'):
+        """Stable sort, like sort_values(by, kind='stable')."""
+        return self._then(('sort', _as_list(by), ascending, na_position))
+
+    def groupby(self, by, sort=True):
+        return LazyGroupBy(self, _as_list(by), sort)
+
+    def head(self, n=5):
+        return self._then(('head', n))
+
+    def explain(self):
+        """Describe the optimized plan that collect() will run."""
+        kind, where, _ = self._source
+        stages = _stages(self._steps)
+        lines = [f"scan {kind}" + (f" {where!r}" if kind != 'frame' else '') +
+                 f" columns={_needed_columns(self._steps) or 'all'}"]
+        streamed = self._streaming_groupby(stages)
+        for stage in stages:
+            if stage[0] == 'rows':
+                _, filters, sorts, columns = stage
+                lines.append(f"  rows filter={filters} sort={[s[0] for s in sorts]} "
+                             f"select={columns or 'all'} (one take)")
+            elif stage[0] == 'groupby':
+                lines.append(f"  groupby {stage[1]} agg={stage[2]}" +
+                             (' (streamed)' if streamed else ''))
+                streamed = False
+            else:
+                lines.append(f"  head {stage[1]}")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"<LazyFrame\n{self.explain()}>"
+
+    def _streaming_groupby(self, stages):
+        # scan -> [filters/selects] -> sorted groupby with exact chunked aggregations
+        if self._source[0] == 'frame':
+            return False
+        if stages and stages[0][0] == 'rows':
+            if stages[0][2]:
+                return False
+            stages = stages[1:]
+        if not stages or stages[0][0] != 'groupby' or not stages[0][3]:
+            return False
+        funcs = [func for funcs in stages[0][2].values() for func in _as_list(funcs)]
+        return all(func in _STREAMING_AGGS for func in funcs)
+
+    def _scan(self, filters, chunked):
+        # Read the source with the leading filters and column set pushed down
+        kind, path, options = self._source
+        columns = _needed_columns(self._steps)
+        if kind == 'csv':
+            where = (lambda chunk: _mask(chunk, filters)) if filters else None
+            reader = iter_csv if chunked else load_csv
+            return reader(path, usecols=columns, where=where, **options)
+
+        pushed = [f for f in filters if isinstance(f, tuple)]
+        rest = [f for f in filters if not isinstance(f, tuple)]
+        if chunked:
+            return (chunk[_mask(chunk, rest)] if rest else chunk for chunk in
+                    iter_table(path, columns, pushed or None, **options))
+        options = {k: v for k, v in options.items() if k != 'batch_size'}
+        frame = read_table(path, columns, pushed or None, **options)
+        return frame[_mask(frame, rest)] if rest else frame
+
+    def collect(self):
+        """Execute the plan and return a DataFrame."""
+        stages = _stages(self._steps)
+        kind = self._source[0]
+        if kind == 'frame':
+            frame = self._source[1]
+        else:
+            leading = stages[0][1] if stages and stages[0][0] == 'rows' else []
+            if self._streaming_groupby(stages):
+                chunks = self._scan(leading, chunked=True)
+                if stages[0][0] == 'rows':
+                    columns = stages[0][3]
+                    chunks = (chunk if columns is None else chunk[columns] for chunk in chunks)
+                    stages = stages[1:]
+                frame = aggregate(chunks, stages[0][1], stages[0][2])
+                stages = stages[1:]
+            else:
+                frame = self._scan(leading, chunked=False)
+                if leading:
+                    stages = [('rows', [], stages[0][2], stages[0][3])] + stages[1:]
+
+        for stage in stages:
+            if stage[0] == 'rows':
+                frame = _run_rows(frame, *stage[1:])
+            elif stage[0] == 'groupby':
+                _, by, spec, sort = stage
+                frame = frame.groupby(by, sort=sort).agg(spec)
+            else:
+                frame = frame.head(stage[1])
+        return frame
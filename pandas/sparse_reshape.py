@@ -0,0 +1,81 @@
+# Sparse and Chunked Reshaping
+
+'''
+pivot_table, melt and pivot for data too large for a dense wide frame:
+Group-by Fast Path: A pivot is computed as one groupby over (index, columns), so only non-empty cells are ever stored.
+Sparse Output: The result is a scipy.sparse matrix with row/column labels, or a DataFrame of pandas sparse columns.
+Chunked Pivot: Chunks are aggregated with chunked_agg and merged, without holding all rows at once.
+Chunked Melt: Wide chunks are melted one at a time into compact long chunks.
+'''
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from chunked_agg import aggregate
+
+
+def _cells(data, index, columns, values, aggfunc):
+    # One row per non-empty (index, columns) cell
+    if isinstance(data, pd.DataFrame):
+        grouped = data.groupby([index, columns], sort=False, observed=True)[values]
+        if aggfunc is None:
+            # .pivot semantics: every cell must hold exactly one value
+            if grouped.size().max() > 1:
+                raise ValueError("Index contains duplicate entries, cannot reshape; "
+                                 "pass an aggfunc")
+            aggfunc = 'first'
+        return grouped.agg(aggfunc)
+    if aggfunc is None:
+        raise ValueError("chunked input needs an aggfunc supported by chunked_agg")
+    return aggregate(data, [index, columns], {values: aggfunc})[values]
+
+
+def sparse_pivot(data, index, columns, values, aggfunc='mean', output='frame'):
+    """pivot_table(values, index, columns, aggfunc) storing only non-empty cells.
+
+    `data` is a DataFrame or an iterable of chunks (aggfunc then limited to
+    what chunked_agg supports). aggfunc=None behaves like .pivot and refuses
+    duplicate cells. Memory is proportional to the number of non-empty cells,
+    never to len(index labels) * len(column labels).
+
+    output='frame' returns a DataFrame of Sparse[float64, nan] columns with
+    the same labels and values as pivot_table; output='coo' or 'csr' returns
+    (matrix, row_labels, column_labels) with absent cells left implicit.
+    """
+    if output not in ('frame', 'coo', 'csr'):
+        raise ValueError("output must be 'frame', 'coo' or 'csr'")
+    cells = _cells(data, index, columns, values, aggfunc).dropna()
+
+    rows, row_labels = pd.factorize(cells.index.get_level_values(0), sort=True)
+    cols, col_labels = pd.factorize(cells.index.get_level_values(1), sort=True)
+    matrix = sp.coo_matrix((cells.to_numpy(dtype=np.float64), (rows, cols)),
+                           shape=(len(row_labels), len(col_labels)))
+    row_labels = pd.Index(row_labels, name=index)
+    col_labels = pd.Index(col_labels, name=columns)
+
+    if output == 'coo':
+        return matrix, row_labels, col_labels
+    if output == 'csr':
+        return matrix.tocsr(), row_labels, col_labels
+    frame = pd.DataFrame.sparse.from_spmatrix(matrix, index=row_labels, columns=col_labels)
+    # Absent cells are NaN, as in pivot_table; stored zeros stay zeros
+    return frame.astype(pd.SparseDtype(np.float64, np.nan))
+
+
+def iter_melt(chunks, id_vars=None, value_vars=None, var_name='variable', value_name='value'):
+    """pd.melt applied chunk by chunk; yields long chunks.
+
+    The variable column is categorical, so each long row costs one small
+    code instead of a repeated column-name string.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    categories = None
+    for chunk in chunks:
+        long = pd.melt(chunk, id_vars=id_vars, value_vars=value_vars,
+                       var_name=var_name, value_name=value_name)
+        if categories is None:
+            categories = list(pd.unique(long[var_name]))
+        long[var_name] = pd.Categorical(long[var_name], categories=categories)
+        yield long